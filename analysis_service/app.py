@@ -1,12 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from config import settings
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from src.candidate.compression import compression_stats
+from src.candidate.exceptions import ExtractionError
+from src.candidate.extraction import extraction_pool
 from src.candidate.router import router as candidate_router
+from src.candidate.storage import cv_store
+from src.candidate.text_store import text_store
+from src.integrations.cache import llm_cache
+from src.integrations.client_pool import client_pool
+from src.integrations.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    ProviderError,
+)
+from src.integrations.rate_limit import rate_limiter
+from src.integrations.resilience import DeadlineMiddleware, retry_policy
+from src.integrations.usage import usage_stats
 from src.job.router import router as job_router
+from src.matching.job_context import job_contexts
 from src.matching.router import router as matching_router
+from src.matching.serializer import prompt_stats
+from src.warmup import readiness, warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm clients, tokenizers and parsers in the background, /readyz reports when done
+    warmup_task = asyncio.create_task(warmup())
+    yield
+    warmup_task.cancel()
+    # Release pooled LLM connections and extraction workers on shutdown
+    await client_pool.aclose()
+    extraction_pool.shutdown()
+
 
 # Create a FastAPI app instance with the specified title from settings
-app = FastAPI(title=settings.APP_NAME)
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 # Configure Cross-Origin Resource Sharing (CORS)
 app.add_middleware(
@@ -17,12 +51,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Propagate the caller's X-Request-Deadline-Ms to every LLM call of the request
+app.add_middleware(DeadlineMiddleware)
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)})
+
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": str(exc)})
+
+
+@app.exception_handler(ProviderError)
+async def provider_error_handler(request: Request, exc: ProviderError):
+    return JSONResponse(status_code=status.HTTP_502_BAD_GATEWAY, content={"detail": str(exc)})
+
+
+@app.exception_handler(ExtractionError)
+async def extraction_error_handler(request: Request, exc: ExtractionError):
+    return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"detail": str(exc)})
+
 
 @app.get("/healthz")
 async def healthcheck() -> bool:
     return True
 
 
+@app.get("/readyz")
+async def readiness_check():
+    state = readiness.stats()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if state["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=state,
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> dict:
+    return {
+        "llm_pool": client_pool.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_rate_limit": rate_limiter.stats(),
+        "llm_retry": retry_policy.stats(),
+        "llm_usage": usage_stats.stats(),
+        "cv_compression": compression_stats.stats(),
+        "cv_extraction": extraction_pool.stats(),
+        "cv_store": cv_store.stats(),
+        "cv_text_store": text_store.stats(),
+        "matching_prompt": prompt_stats.stats(),
+        "matching_job_contexts": job_contexts.stats(),
+    }
+
+
 app.include_router(candidate_router, prefix="/candidate", tags=["Candidate"])
 app.include_router(job_router, prefix="/job", tags=["Job"])
 app.include_router(matching_router, prefix="/matching", tags=["Matching"])
@@ -0,0 +1,93 @@
+"""
+Concurrency scaling benchmark for the analysis service.
+
+Fires batches of concurrent /job/analyse requests at a running instance and
+reports throughput and latency for each concurrency level. With the async
+LLM path a single uvicorn worker should scale close to linearly until the
+provider becomes the bottleneck.
+
+Every request carries a unique reference in its job description, so the
+LLM cache and in-flight coalescing (LLM_CACHE_ENABLED) never answer it and
+each request is a real LLM call.
+
+Usage:
+    python benchmarks/bench_concurrency.py --url http://localhost:7070 --levels 1 8 32 64
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import httpx
+
+JOB_PAYLOAD = {
+    "job_name": "Python Developer",
+    "job_description": (
+        "We are looking for a Python Developer with 3+ years of experience in FastAPI, "
+        "SQL and Docker. Bachelor's degree in Computer Science. Good communication and "
+        "teamwork skills. AWS certification is a plus."
+    ),
+}
+
+
+REQUEST_IDS = itertools.count()
+
+
+def unique_payload():
+    # A different prompt per request, the cache would otherwise serve all but the first
+    return {
+        **JOB_PAYLOAD,
+        "job_description": f"{JOB_PAYLOAD['job_description']} Ref: {time.time_ns()}-{next(REQUEST_IDS)}.",
+    }
+
+
+async def timed_request(client, url):
+    payload = unique_payload()
+    start = time.perf_counter()
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_level(base_url, concurrency, rounds):
+    url = f"{base_url}/job/analyse"
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=600) as client:
+        start = time.perf_counter()
+        latencies = []
+        for _ in range(rounds):
+            latencies += await asyncio.gather(
+                *(timed_request(client, url) for _ in range(concurrency))
+            )
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:7070")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>11} {'requests':>8} {'req/s':>8} {'p50 (s)':>8} {'p95 (s)':>8}")
+    for level in args.levels:
+        result = await run_level(args.url, level, args.rounds)
+        print(
+            f"{result['concurrency']:>11} {result['requests']:>8} "
+            f"{result['throughput']:>8.2f} {result['p50']:>8.2f} {result['p95']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+CV text extraction benchmark.
+
+Compares the LangChain loaders (PyPDFLoader / Docx2txtLoader with
+load_and_split, the previous extraction path) with the streaming extractors
+in src/candidate/extractors.py on sample CVs. Both run in process, one file
+at a time, so the numbers are pure parsing cost.
+
+The corpus is either the CV store (sharded files without extension, the
+default) or a plain directory of .pdf and .docx files.
+
+Usage:
+    python benchmarks/bench_extraction.py --corpus candidate_cv/ --rounds 3 --token-budget 12000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.candidate.config import candidate_config  # noqa: E402
+from src.candidate.storage import CVStore  # noqa: E402
+from src.candidate.extractors import (  # noqa: E402
+    iter_docx_paragraphs,
+    iter_pdf_pages,
+    open_pdf,
+    take_token_budget,
+)
+from src.integrations.tokenizer import count_tokens  # noqa: E402
+
+
+def langchain_extract(file_path, file_type, token_budget):
+    from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader
+
+    loader = PyPDFLoader(file_path) if file_type == "pdf" else Docx2txtLoader(file_path)
+    return "".join(document.page_content for document in loader.load_and_split())
+
+
+def streaming_extract(file_path, file_type, token_budget):
+    if file_type == "pdf":
+        chunks = iter_pdf_pages(open_pdf(file_path))
+    else:
+        chunks = iter_docx_paragraphs(file_path)
+    return "\n".join(take_token_budget(chunks, token_budget, candidate_config.MODEL_NAME))
+
+
+def run(extract, files, rounds, token_budget):
+    latencies = []
+    tokens = 0
+    for round_index in range(rounds):
+        for file_path, file_type in files:
+            start = time.perf_counter()
+            text = extract(file_path, file_type, token_budget)
+            latencies.append(time.perf_counter() - start)
+            if round_index == 0:
+                tokens += count_tokens(text, candidate_config.MODEL_NAME)
+
+    latencies.sort()
+    return {
+        "files": len(latencies),
+        "avg_tokens": tokens / len(files),
+        "total": sum(latencies),
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+    }
+
+
+def list_corpus(corpus):
+    """(path, file type) of the CVs in a plain directory and in the CV store layout under it."""
+    files = [
+        (os.path.join(corpus, name), name.lower().rsplit(".", 1)[-1])
+        for name in os.listdir(corpus)
+        if name.lower().endswith((".pdf", ".docx"))
+    ]
+    store = CVStore(corpus)
+    for digest in store.iter_digests():
+        file_type = store.file_type(digest)
+        if file_type in ("pdf", "docx"):
+            files.append((store.path_for(digest), file_type))
+    return sorted(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=candidate_config.CV_UPLOAD_DIR)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--token-budget", type=int, default=candidate_config.CV_EXTRACT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    files = list_corpus(args.corpus)
+    if not files:
+        sys.exit(f"No PDF or DOCX files in {args.corpus}")
+
+    print(f"{len(files)} files, {args.rounds} rounds, token budget {args.token_budget}")
+    print(f"{'extractor':>10} {'files':>6} {'total (s)':>10} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'tokens':>7}")
+    for name, extract in [("langchain", langchain_extract), ("streaming", streaming_extract)]:
+        result = run(extract, files, args.rounds, args.token_budget)
+        print(
+            f"{name:>10} {result['files']:>6} {result['total']:>10.2f} "
+            f"{result['mean_ms']:>10.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['avg_tokens']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Matching prompt size benchmark.
+
+Compares the tokens of one matching call built from str() of the stored
+documents (the previous prompt) with the compact layout of
+src/matching/serializer.py, over jobs and candidates exported from MongoDB:
+
+    mongoexport --uri "$MONGO_URL" --collection job --out jobs.jsonl
+    mongoexport --uri "$MONGO_URL" --collection candidate --out candidates.jsonl
+
+Both JSON lines and --jsonArray exports are accepted. Every job is paired
+with every candidate, up to --max-pairs pairs.
+
+Usage:
+    python benchmarks/bench_serializer.py --jobs jobs.jsonl --candidates candidates.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.integrations.tokenizer import count_tokens  # noqa: E402
+from src.matching.config import matching_config  # noqa: E402
+from src.matching.job_context import JobContext  # noqa: E402
+from src.matching.prompts import system_prompt_matching  # noqa: E402
+from src.matching.service import generate_content  # noqa: E402
+
+
+def load_documents(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def str_prompt(job, candidate):
+    return system_prompt_matching + "\nRequirement:" + str(job) + "\nCandidate:" + str(candidate)
+
+
+def compact_prompt(job, candidate):
+    return JobContext(job.get("_id", ""), job).system_prompt + generate_content(candidate)
+
+
+def run(build, pairs):
+    tokens = []
+    started = time.perf_counter()
+    prompts = [build(job, candidate) for job, candidate in pairs]
+    elapsed = time.perf_counter() - started
+    for prompt in prompts:
+        tokens.append(count_tokens(prompt, matching_config.MODEL_NAME))
+
+    tokens.sort()
+    return {
+        "mean": statistics.mean(tokens),
+        "p50": statistics.median(tokens),
+        "p95": tokens[max(int(len(tokens) * 0.95) - 1, 0)],
+        "total": sum(tokens),
+        "build_us": elapsed / len(pairs) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", required=True, help="mongoexport of the job collection")
+    parser.add_argument("--candidates", required=True, help="mongoexport of the candidate collection")
+    parser.add_argument("--max-pairs", type=int, default=1000)
+    args = parser.parse_args()
+
+    jobs = load_documents(args.jobs)
+    candidates = load_documents(args.candidates)
+    pairs = list(itertools.islice(itertools.product(jobs, candidates), args.max_pairs))
+    if not pairs:
+        sys.exit("No job/candidate pairs in the exports")
+
+    print(f"{len(jobs)} jobs, {len(candidates)} candidates, {len(pairs)} pairs, model {matching_config.MODEL_NAME}")
+    print(f"{'prompt':>10} {'mean':>8} {'p50':>8} {'p95':>8} {'total':>10} {'build (us)':>11}")
+    results = {}
+    for name, build in [("str", str_prompt), ("compact", compact_prompt)]:
+        result = results[name] = run(build, pairs)
+        print(
+            f"{name:>10} {result['mean']:>8.0f} {result['p50']:>8.0f} {result['p95']:>8} "
+            f"{result['total']:>10} {result['build_us']:>11.1f}"
+        )
+
+    saved = results["str"]["mean"] - results["compact"]["mean"]
+    print(f"tokens saved per call: {saved:.0f} ({saved / results['str']['mean']:.1%} of the prompt)")
+
+
+if __name__ == "__main__":
+    main()
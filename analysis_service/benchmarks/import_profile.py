@@ -0,0 +1,116 @@
+"""
+Import-time profile and cold-start guard for the analysis service.
+
+Imports `app` in a fresh interpreter with -X importtime and reports the
+slowest modules. With --check it fails when the import takes longer than the
+budget in benchmarks/import_budget.json, or when a module listed as deferred
+(langchain, openai, tiktoken, parsers...) is loaded by the import, which
+means someone added a heavy import at module level again.
+
+Usage:
+    python benchmarks/import_profile.py            # print the profile
+    python benchmarks/import_profile.py --write    # refresh benchmarks/import_profile.txt
+    python benchmarks/import_profile.py --check    # exit 1 when over budget
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(SERVICE_DIR, "benchmarks", "import_budget.json")
+PROFILE_FILE = os.path.join(SERVICE_DIR, "benchmarks", "import_profile.txt")
+
+LOADED_MODULES_SCRIPT = """
+import json, sys
+import app
+print(json.dumps(sorted(name for name in sys.modules)))
+"""
+
+
+def profile_import():
+    """Return {module: cumulative microseconds} for one cold `import app`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def loaded_modules():
+    result = subprocess.run(
+        [sys.executable, "-c", LOADED_MODULES_SCRIPT],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def format_profile(cumulative, top):
+    lines = [f"{'cumulative (ms)':>15}  module"]
+    for name, micros in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{micros / 1000:>15.1f}  {name}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--write", action="store_true", help=f"write the profile to {PROFILE_FILE}")
+    parser.add_argument("--check", action="store_true", help="fail when over the budget")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    # The first run warms the OS page cache, the median of the rest is reported
+    profile_import()
+    profiles = [profile_import() for _ in range(args.rounds)]
+    total_ms = statistics.median(profile["app"] for profile in profiles) / 1000
+    report = format_profile(profiles[-1], args.top)
+
+    print(f"import app: {total_ms:.1f} ms (median of {args.rounds}), budget {budget['max_import_ms']} ms")
+    print(report)
+
+    if args.write:
+        with open(PROFILE_FILE, "w", encoding="utf-8") as f:
+            f.write(f"# python benchmarks/import_profile.py --write, Python {sys.version.split()[0]}\n")
+            f.write(f"# import app: {total_ms:.1f} ms (median of {args.rounds})\n")
+            f.write(report + "\n")
+
+    if args.check:
+        failures = []
+        if total_ms > budget["max_import_ms"]:
+            failures.append(f"import app took {total_ms:.1f} ms, budget is {budget['max_import_ms']} ms")
+
+        modules = loaded_modules()
+        eager = [
+            name
+            for name in budget["deferred_modules"]
+            if name in modules
+        ]
+        if eager:
+            failures.append(f"modules that must be imported lazily are loaded by `import app`: {', '.join(eager)}")
+
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
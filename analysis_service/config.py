@@ -29,5 +29,40 @@ class Settings(BaseSettings):
     AZURE_OPENAI_API_BASE: str = os.getenv("AZURE_OPENAI_API_BASE", "")
     AZURE_OPENAI_DEPLOYMENT: str = os.getenv("AZURE_OPENAI_DEPLOYMENT", "")
 
+    # LLM provider: "azure" or "fake" (local stand-in for load testing)
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "azure")
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "lognormal")
+    FAKE_LLM_LATENCY_MEAN_MS: float = float(os.getenv("FAKE_LLM_LATENCY_MEAN_MS", "800"))
+    FAKE_LLM_LATENCY_STDDEV_MS: float = float(os.getenv("FAKE_LLM_LATENCY_STDDEV_MS", "300"))
+    FAKE_LLM_ERROR_RATE: float = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    FAKE_LLM_SEED: int = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+    # LLM connection pool
+    LLM_POOL_MAX_CONNECTIONS: int = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20"))
+    LLM_POOL_MAX_KEEPALIVE: int = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10"))
+    LLM_POOL_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+
+    # Retries, per-attempt timeout and circuit breaker around LLM calls
+    LLM_CALL_TIMEOUT: float = float(os.getenv("LLM_CALL_TIMEOUT", "60"))
+    LLM_RETRY_ATTEMPTS: int = int(os.getenv("LLM_RETRY_ATTEMPTS", "3"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Outbound rate limit shared by all workers on the host, 0 disables a bucket
+    LLM_RATE_LIMIT_RPM: int = int(os.getenv("LLM_RATE_LIMIT_RPM", "0"))
+    LLM_RATE_LIMIT_TPM: int = int(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+    LLM_RATE_LIMIT_OUTPUT_TOKENS: int = int(os.getenv("LLM_RATE_LIMIT_OUTPUT_TOKENS", "800"))
+    LLM_RATE_LIMIT_STATE_FILE: str = os.getenv(
+        "LLM_RATE_LIMIT_STATE_FILE", "/tmp/analysis_service_rate_limit.json"
+    )
+
+    # LLM result cache, bump the prompt version to invalidate old entries
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", "")
+    LLM_PROMPT_VERSION: str = os.getenv("LLM_PROMPT_VERSION", "1")
+
 
 settings = Settings()
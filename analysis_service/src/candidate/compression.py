@@ -0,0 +1,230 @@
+import re
+import threading
+
+from src.candidate.config import candidate_config
+from src.integrations.tokenizer import count_tokens
+
+# Section priority when the CV must be trimmed, lower is kept first
+SECTION_PRIORITY = [
+    (re.compile(r"experience|employment|work history|career"), 0),
+    (re.compile(r"skill|technolog|competenc|tools"), 1),
+    (re.compile(r"education|academic|qualification|degree"), 2),
+    (re.compile(r"project"), 3),
+    (re.compile(r"certif|licen[cs]e|course|training|award"), 4),
+    (re.compile(r"summary|profile|objective|about"), 5),
+    (re.compile(r"language|leadership|activit|volunteer"), 6),
+    (re.compile(r"hobb|interest|reference|declaration|personal"), 9),
+]
+DEFAULT_SECTION_PRIORITY = 7
+
+WHITESPACE_RUN = re.compile(r"[ \t\u00a0\u200b]+")
+# Lines at each end of a page that may hold a running header or footer
+EDGE_LINES = 3
+PAGE_NUMBER = re.compile(r"^\W*(page\s*)?\d+(\s*(/|of)\s*\d+)?\W*$", re.IGNORECASE)
+# "Page 3 of 10" inside a running header or footer
+PAGE_REFERENCE = re.compile(r"\bpage\s*\d+(\s*(/|of)\s*\d+)?", re.IGNORECASE)
+
+
+class CompressionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.trimmed_documents = 0
+
+    def record(self, tokens_before, tokens_after, trimmed):
+        with self._lock:
+            self.documents += 1
+            self.tokens_before += tokens_before
+            self.tokens_after += tokens_after
+            self.trimmed_documents += int(trimmed)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "trimmed_documents": self.trimmed_documents,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "tokens_saved": self.tokens_before - self.tokens_after,
+            }
+
+
+compression_stats = CompressionStats()
+
+
+def normalise_lines(text):
+    lines = []
+    for line in text.splitlines():
+        line = WHITESPACE_RUN.sub(" ", line).strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+def edge_key(line):
+    # Running headers/footers may carry the page number, other digits must match
+    return PAGE_REFERENCE.sub("page #", line).casefold()
+
+
+def repeated_keys(edges, threshold):
+    page_counts = {}
+    for lines in edges:
+        for key in {edge_key(line) for line in lines}:
+            page_counts[key] = page_counts.get(key, 0) + 1
+    return {key for key, count in page_counts.items() if count >= threshold}
+
+
+def remove_repeated_lines(pages):
+    """
+    Strip running headers/footers and page numbers.
+
+    A line near the top of a page that shows up near the top of enough pages
+    is kept on its first page only, the same goes for bottom lines, since the
+    first header usually carries the candidate's name and contacts. Lines
+    are compared exactly apart from a "Page N of M" reference, so dated
+    entries that happen to sit at a page edge are kept.
+    """
+    pages = [[line for line in page if not PAGE_NUMBER.match(line)] for page in pages]
+    if len(pages) < 2:
+        return pages
+
+    threshold = max(2, len(pages) * candidate_config.CV_REPEATED_LINE_RATIO)
+    repeated_top = repeated_keys([page[:EDGE_LINES] for page in pages], threshold)
+    repeated_bottom = repeated_keys([page[-EDGE_LINES:] for page in pages], threshold)
+
+    seen = set()
+    cleaned_pages = []
+    for page in pages:
+        cleaned_page = []
+        for position, line in enumerate(page):
+            key = edge_key(line)
+            edge = None
+            if position < EDGE_LINES and key in repeated_top:
+                edge = "top"
+            elif position >= len(page) - EDGE_LINES and key in repeated_bottom:
+                edge = "bottom"
+            if edge is not None:
+                if (edge, key) in seen:
+                    continue
+                seen.add((edge, key))
+            cleaned_page.append(line)
+        cleaned_pages.append(cleaned_page)
+    return cleaned_pages
+
+
+def drop_duplicate_lines(lines):
+    seen = set()
+    unique_lines = []
+    for line in lines:
+        key = line.casefold()
+        if key not in seen:
+            seen.add(key)
+            unique_lines.append(line)
+    return unique_lines
+
+
+def is_heading(line):
+    if len(line) > 40 or line.endswith((".", ",", ";")):
+        return False
+    if line.isupper() or line.endswith(":"):
+        return True
+    return len(line.split()) <= 4 and any(
+        pattern.search(line.lower()) for pattern, _ in SECTION_PRIORITY
+    )
+
+
+def split_sections(lines):
+    sections = []
+    for line in lines:
+        if not sections or is_heading(line):
+            sections.append([line])
+        else:
+            sections[-1].append(line)
+    return sections
+
+
+def section_priority(section):
+    heading = section[0].lower()
+    for pattern, priority in SECTION_PRIORITY:
+        if pattern.search(heading):
+            return priority
+    return DEFAULT_SECTION_PRIORITY
+
+
+def take_lines(lines, line_tokens, start, limit):
+    """Index past the lines from start that fit in limit, and the tokens they use."""
+    end, used = start, 0
+    while end < len(lines) and used + line_tokens[end] <= limit:
+        used += line_tokens[end]
+        end += 1
+    return end, used
+
+
+def trim_to_budget(lines, budget, model_name):
+    """
+    Keep the most informative sections within the token budget.
+
+    The first section, which holds the candidate's name and contacts, is
+    always kept. Other sections are taken by priority (experience and skills
+    first, hobbies and references last), each capped at
+    CV_SECTION_BUDGET_SHARE of the budget so one long section cannot push out
+    the rest. Whatever budget is left then goes to the capped sections in the
+    same order. Sections are emitted in their original order.
+    """
+    sections = split_sections(lines)
+    line_tokens = [[count_tokens(line, model_name) + 1 for line in section] for section in sections]
+
+    order = sorted(range(len(sections)), key=lambda i: (-1 if i == 0 else section_priority(sections[i]), i))
+    cap = int(budget * candidate_config.CV_SECTION_BUDGET_SHARE)
+    kept = [0] * len(sections)
+    remaining = budget
+    for i in order:
+        limit = remaining if i == 0 else min(remaining, cap)
+        kept[i], used = take_lines(sections[i], line_tokens[i], 0, limit)
+        remaining -= used
+
+    for i in order:
+        if kept[i] < len(sections[i]):
+            kept[i], used = take_lines(sections[i], line_tokens[i], kept[i], remaining)
+            remaining -= used
+
+    return [line for section, count in zip(sections, kept) for line in section[:count]]
+
+
+def compress_cv_content(pages, budget=None, model_name=None):
+    """
+    Normalise and shrink extracted CV text before it is sent to the LLM.
+
+    Args:
+        pages: Raw text of each page or chunk of the document
+        budget: Max tokens to keep, defaults to CV_TOKEN_BUDGET
+        model_name: Model whose tokenizer is used for counting
+
+    Returns:
+        tuple: The compressed text and a dict with token counts before/after
+    """
+    budget = budget or candidate_config.CV_TOKEN_BUDGET
+    model_name = model_name or candidate_config.MODEL_NAME
+
+    raw_text = "".join(pages)
+    tokens_before = count_tokens(raw_text, model_name)
+
+    page_lines = remove_repeated_lines([normalise_lines(page) for page in pages])
+    lines = drop_duplicate_lines([line for page in page_lines for line in page])
+
+    content = "\n".join(lines)
+    trimmed = count_tokens(content, model_name) > budget
+    if trimmed:
+        content = "\n".join(trim_to_budget(lines, budget, model_name))
+
+    tokens_after = count_tokens(content, model_name)
+    compression_stats.record(tokens_before, tokens_after, trimmed)
+
+    return content, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+        "trimmed": trimmed,
+    }
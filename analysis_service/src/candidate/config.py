@@ -5,6 +5,36 @@ class CandidateConfig(BaseSettings):
     MODEL_NAME: str = "gpt-3.5-turbo-16k"
 
     CV_UPLOAD_DIR: str = "./candidate_cv/"
+    # Keep a copy of every uploaded CV, written in the background after the response
+    CV_PERSIST_UPLOADS: bool = True
+
+    # zstd compressed extracted text keyed by file hash, skips re-parsing known CVs
+    CV_TEXT_STORE_ENABLED: bool = True
+    CV_TEXT_STORE_DIR: str = "./candidate_text/"
+    # Bump when the extractors or their page/token limits change
+    CV_TEXT_STORE_VERSION: int = 1
+    CV_TEXT_STORE_LEVEL: int = 6
+
+    # Max tokens of CV text sent to the LLM after compression
+    CV_TOKEN_BUDGET: int = 6000
+    # A line on at least this share of pages is treated as a page header/footer
+    CV_REPEATED_LINE_RATIO: float = 0.5
+    # Share of the budget one section may take before the others get theirs
+    CV_SECTION_BUDGET_SHARE: float = 0.5
+
+    # Text extraction runs in a process pool with per-file limits
+    CV_EXTRACT_WORKERS: int = 2
+    # Wall-clock limit per file in seconds
+    CV_EXTRACT_TIMEOUT: float = 30
+    # Address space limit per extraction process in MB, 0 disables it
+    CV_EXTRACT_MEMORY_MB: int = 1024
+    # Pages past this cap are never parsed
+    CV_MAX_PAGES: int = 30
+    # PDFs with more pages than this are split across the pool
+    CV_PARALLEL_PAGE_THRESHOLD: int = 6
+    # Stop reading a CV once this many tokens of raw text are extracted, 0 reads
+    # everything. Kept above CV_TOKEN_BUDGET so compression still has headroom.
+    CV_EXTRACT_TOKEN_BUDGET: int = 12000
 
 
 candidate_config = CandidateConfig()
@@ -0,0 +1,10 @@
+class ExtractionError(Exception):
+    """The CV could not be turned into text."""
+
+
+class ExtractionTimeoutError(ExtractionError):
+    """Extracting the CV took longer than the per-file time limit."""
+
+
+class ExtractionPoolRestartedError(ExtractionError):
+    """The pool was restarted for another file while this one was extracted."""
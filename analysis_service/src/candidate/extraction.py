@@ -0,0 +1,305 @@
+import io
+import math
+import multiprocessing
+import os
+import resource
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from src.candidate.config import candidate_config
+from src.candidate.exceptions import ExtractionError, ExtractionPoolRestartedError, ExtractionTimeoutError
+from src.candidate.extractors import (
+    iter_docx_paragraphs,
+    iter_pdf_pages,
+    open_pdf,
+    sniff_file_type,
+    take_token_budget,
+)
+from src.integrations.tokenizer import count_tokens
+from src.utils import LOGGER
+
+
+def init_worker(memory_limit_mb):
+    # The parent handles shutdown, workers are terminated by it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def read_pdf_pages(data, start, stop, token_budget, model_name):
+    """Text of pages [start, stop) up to the token budget, and the page count of the PDF."""
+    reader = open_pdf(io.BytesIO(data))
+    pages = iter_pdf_pages(reader, start, stop)
+    return len(reader.pages), list(take_token_budget(pages, token_budget, model_name))
+
+
+def read_docx(data, token_budget, model_name):
+    paragraphs = take_token_budget(iter_docx_paragraphs(io.BytesIO(data)), token_budget, model_name)
+    return ["\n".join(paragraphs)]
+
+
+def warm_worker():
+    # Load the parsers so the first CV does not pay for the imports
+    import pypdf  # noqa: F401
+
+    return os.getpid()
+
+
+def page_ranges(start, stop, parts):
+    """Split [start, stop) into at most `parts` contiguous ranges."""
+    size = max(math.ceil((stop - start) / max(parts, 1)), 1)
+    return [(offset, min(offset + size, stop)) for offset in range(start, stop, size)]
+
+
+class ExtractionPool:
+    """
+    Bounded process pool for CV text extraction.
+
+    Every worker runs under an address space limit, and every file has a
+    wall-clock limit and a page cap. A file that runs past its limit gets its
+    workers killed and the pool restarted, so one pathological PDF can not pin
+    a core or exhaust memory. Files caught in a restart caused by another
+    file are extracted once more on the new pool. PDFs longer than CV_PARALLEL_PAGE_THRESHOLD
+    pages have their remaining pages extracted in parallel across the pool.
+    Extraction stops once CV_EXTRACT_TOKEN_BUDGET tokens of text are read.
+    """
+
+    def __init__(
+        self,
+        max_workers,
+        timeout,
+        memory_limit_mb,
+        max_pages,
+        parallel_page_threshold,
+        token_budget,
+        model_name,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_pages = max_pages
+        self.parallel_page_threshold = parallel_page_threshold
+        self.token_budget = token_budget
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._executor = None
+        self._started = time.monotonic()
+        self.in_flight = 0
+        self.tasks = 0
+        self.busy_seconds = 0.0
+        self.documents = 0
+        self.pages = 0
+        self.capped_documents = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.timeouts = 0
+        self.failures = 0
+        self.restarts = 0
+        self.retries = 0
+
+    def after_fork(self):
+        # Never share the parent's worker processes
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                    initargs=(self.memory_limit_mb,),
+                )
+            return self._executor
+
+    def _restart(self, executor):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.restarts += 1
+        # A hung worker ignores cancellation, kill every process of the old pool
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _broken(self, executor, message, error):
+        """Restart a broken pool, or report that another file already restarted it."""
+        with self._lock:
+            replaced = self._executor is not executor
+        if replaced:
+            raise ExtractionPoolRestartedError("CV extraction pool was restarted") from error
+        self._restart(executor)
+        raise ExtractionError(message) from error
+
+    def _run(self, executor, calls, deadline):
+        """Run (fn, *args) calls in parallel and return their results in order."""
+
+        def timed(fn, *args):
+            started = time.monotonic()
+            with self._lock:
+                self.in_flight += 1
+                self.tasks += 1
+            future = executor.submit(fn, *args)
+
+            def done(_):
+                with self._lock:
+                    self.in_flight -= 1
+                    self.busy_seconds += time.monotonic() - started
+
+            future.add_done_callback(done)
+            return future
+
+        try:
+            futures = [timed(fn, *args) for fn, *args in calls]
+        except (BrokenProcessPool, RuntimeError) as e:
+            # RuntimeError: the pool was shut down by a restart
+            self._broken(executor, "CV extraction pool is unavailable", e)
+
+        _, pending = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        if pending:
+            with self._lock:
+                self.timeouts += 1
+            self._restart(executor)
+            raise ExtractionTimeoutError(f"CV extraction exceeded {self.timeout}s")
+
+        try:
+            return [future.result() for future in futures]
+        except (BrokenProcessPool, CancelledError) as e:
+            self._broken(executor, "CV extraction worker crashed, the file may exceed the memory limit", e)
+        except MemoryError as e:
+            raise ExtractionError("CV extraction exceeded the memory limit") from e
+        except Exception as e:
+            raise ExtractionError(f"Can not read CV: {str(e)}") from e
+
+    def _extract_pdf(self, executor, data, deadline):
+        first_stop = min(self.parallel_page_threshold, self.max_pages)
+        ((page_count, texts),) = self._run(
+            executor,
+            [(read_pdf_pages, data, 0, first_stop, self.token_budget, self.model_name)],
+            deadline,
+        )
+
+        stop = min(page_count, self.max_pages)
+        remaining_budget = self.token_budget
+        if remaining_budget > 0:
+            remaining_budget -= count_tokens("".join(texts), self.model_name)
+            if remaining_budget <= 0:
+                return texts, page_count > self.max_pages
+
+        if stop > first_stop:
+            calls = [
+                (read_pdf_pages, data, start, end, remaining_budget, self.model_name)
+                for start, end in page_ranges(first_stop, stop, self.max_workers)
+            ]
+            for _, chunk in self._run(executor, calls, deadline):
+                texts.extend(chunk)
+            # Ranges ran without knowing each other's size, cut the tail in page order
+            texts = list(take_token_budget(texts, self.token_budget, self.model_name))
+        return texts, page_count > self.max_pages
+
+    def _extract(self, data, file_name, deadline):
+        executor = self._get_executor()
+        file_type = sniff_file_type(data) or file_name.lower().rsplit(".", 1)[-1]
+        if file_type == "pdf":
+            return self._extract_pdf(executor, data, deadline)
+        if file_type == "docx":
+            (texts,) = self._run(executor, [(read_docx, data, self.token_budget, self.model_name)], deadline)
+            return texts, False
+        raise ExtractionError(f"Unsupported CV file type: {file_name}")
+
+    def extract(self, data, file_name=""):
+        """
+        Extract the text of a PDF or DOCX file, one string per page.
+
+        The bytes are handed to the workers directly, nothing is read back
+        from disk. The parser is picked from the magic bytes, the file name
+        extension is only a fallback.
+
+        Args:
+            data (bytes): Content of the CV
+            file_name (str): Original file name, used for the fallback and logs
+
+        Returns:
+            list: Page texts, at most CV_MAX_PAGES of them
+        """
+        started = time.monotonic()
+        try:
+            try:
+                texts, capped = self._extract(data, file_name, started + self.timeout)
+            except ExtractionPoolRestartedError:
+                # Another file timed out or crashed and took the workers down with it
+                LOGGER.warning(f"CV extraction pool restarted while reading {file_name}, retrying")
+                with self._lock:
+                    self.retries += 1
+                texts, capped = self._extract(data, file_name, time.monotonic() + self.timeout)
+        except ExtractionError:
+            with self._lock:
+                self.failures += 1
+            raise
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.documents += 1
+            self.pages += len(texts)
+            self.capped_documents += int(capped)
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+        LOGGER.info(f"Extracted {len(texts)} pages from {file_name} in {elapsed:.3f}s")
+        return texts
+
+    def warmup(self):
+        """Start the worker processes and load the parsers in each of them."""
+        executor = self._get_executor()
+        futures = [executor.submit(warm_worker) for _ in range(self.max_workers)]
+        done, pending = wait(futures, timeout=self.timeout)
+        if pending:
+            raise ExtractionTimeoutError("CV extraction workers did not start in time")
+        return len({future.result() for future in done})
+
+    def stats(self):
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            return {
+                "workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "tasks": self.tasks,
+                "utilisation": self.busy_seconds / (self.max_workers * uptime) if uptime else 0.0,
+                "documents": self.documents,
+                "pages": self.pages,
+                "capped_documents": self.capped_documents,
+                "avg_seconds": self.total_seconds / self.documents if self.documents else 0.0,
+                "max_seconds": self.max_seconds,
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+                "restarts": self.restarts,
+                "retries": self.retries,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = ExtractionPool(
+    max_workers=candidate_config.CV_EXTRACT_WORKERS,
+    timeout=candidate_config.CV_EXTRACT_TIMEOUT,
+    memory_limit_mb=candidate_config.CV_EXTRACT_MEMORY_MB,
+    max_pages=candidate_config.CV_MAX_PAGES,
+    parallel_page_threshold=candidate_config.CV_PARALLEL_PAGE_THRESHOLD,
+    token_budget=candidate_config.CV_EXTRACT_TOKEN_BUDGET,
+    model_name=candidate_config.MODEL_NAME,
+)
+
+os.register_at_fork(after_in_child=extraction_pool.after_fork)
@@ -0,0 +1,104 @@
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from src.integrations.tokenizer import count_tokens
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+PARAGRAPH = WORD_NAMESPACE + "p"
+TEXT = WORD_NAMESPACE + "t"
+TAB = WORD_NAMESPACE + "tab"
+BREAKS = {WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr"}
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def sniff_file_type(head):
+    """
+    File type of a CV from its first bytes, None when it is neither PDF nor DOCX.
+
+    Only PDF and DOCX are accepted, so any zip container is taken as DOCX and
+    the DOCX parser rejects other archives.
+    """
+    # Some generators put junk before the PDF header, readers accept it in the first 1 KB
+    if PDF_MAGIC in head[:1024]:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        return "docx"
+    return None
+
+
+def open_pdf(source):
+    """Open a PDF from a path or binary file object, pages are parsed on access."""
+    from pypdf import PdfReader
+
+    return PdfReader(source)
+
+
+def iter_pdf_pages(reader, start=0, stop=None):
+    """
+    Yield the text of PDF pages one by one.
+
+    Pages are parsed lazily, so a consumer that stops early never pays for
+    the rest of the document.
+
+    Args:
+        reader: PdfReader from open_pdf
+        start: Index of the first page
+        stop: Index after the last page, defaults to the page count
+    """
+    stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+    for index in range(start, stop):
+        yield reader.pages[index].extract_text()
+
+
+def iter_docx_paragraphs(source):
+    """
+    Yield the text of DOCX paragraphs straight from word/document.xml.
+
+    The XML is read incrementally from the zip, without building the whole
+    tree or going through docx2txt.
+
+    Args:
+        source: Path or binary file object of the DOCX
+    """
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document:
+        parts = []
+        for event, element in iterparse(document, events=("end",)):
+            if element.tag == TEXT:
+                parts.append(element.text or "")
+            elif element.tag == TAB:
+                parts.append("\t")
+            elif element.tag in BREAKS:
+                parts.append("\n")
+            elif element.tag == PARAGRAPH:
+                text = "".join(parts).strip()
+                parts = []
+                # Paragraph content is consumed, free it as we go
+                element.clear()
+                if text:
+                    yield text
+
+
+def take_token_budget(chunks, budget, model_name):
+    """
+    Pass chunks through until `budget` tokens have been yielded.
+
+    The chunk that crosses the budget is kept whole, trimming is left to the
+    compression step. A budget of 0 or less disables the limit.
+    """
+    chunks = iter(chunks)
+    if budget <= 0:
+        yield from chunks
+        return
+
+    total = 0
+    for chunk in chunks:
+        yield chunk
+        total += count_tokens(chunk, model_name)
+        if total >= budget:
+            # Closing the source generator stops parsing the remaining pages
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            return
@@ -1,19 +1,65 @@
-from fastapi import APIRouter, File, UploadFile
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, UploadFile, status
 from src.candidate import service
+from src.candidate.config import candidate_config
+from src.candidate.storage import cv_store
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter()
 
 
 # @router.post("/analyse", response_model=ResponseSchema)
 @router.post("/analyse")
-async def analyse_candidate(file: UploadFile = File(...)):
+async def analyse_candidate(
+    background_tasks: BackgroundTasks,
+    file: Optional[UploadFile] = File(None),
+    filehash: Optional[str] = Form(None),
+    retain: bool = Form(True),
+):
     # if file.content_type != 'application/json':
     #     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Wow, That's not allowed")
 
-    file_name = await service.save_cv_candidate(file=file)
+    if file is None:
+        if not filehash:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Send a file or a filehash")
+
+        # Known content is analysed from the stored text or file, 404 asks the caller for the bytes
+        try:
+            cv_content = await run_in_threadpool(service.read_cv_candidate_by_hash, filehash)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if cv_content is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+
+        # A new candidate for known content holds its own reference, re-analysis passes retain=false
+        if retain:
+            background_tasks.add_task(cv_store.retain, filehash)
+    else:
+        # Spooled upload buffer, parsed from memory without a round trip through disk
+        contents = await file.read()
 
-    cv_content = service.read_cv_candidate(file_name=file_name)
+        # PDF/DOCX parsing is CPU bound, keep it off the event loop
+        cv_content, filehash = await run_in_threadpool(
+            service.read_cv_candidate, contents=contents, file_name=file.filename
+        )
 
-    result = service.analyse_candidate(cv_content=cv_content)
+        # Keeping a copy of the CV is not on the request path, write it after the response
+        if candidate_config.CV_PERSIST_UPLOADS:
+            background_tasks.add_task(service.save_cv_candidate, contents, filehash)
+
+    result = await service.analyse_candidate(cv_content=cv_content)
 
     return result
+
+
+@router.delete("/cv/{filehash}")
+async def release_cv(filehash: str):
+    # Drop one reference, unreferenced CVs are removed by `python -m src.candidate.storage gc`
+    try:
+        refs = await run_in_threadpool(cv_store.release, filehash)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if refs is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    return {"filehash": filehash, "refs": refs}
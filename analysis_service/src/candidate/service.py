@@ -1,63 +1,78 @@
-import json
-import os
+import hashlib
 import time
-from datetime import datetime
 
-from langchain.schema import HumanMessage, SystemMessage
-from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader
+from src.candidate.compression import compress_cv_content
 from src.candidate.config import candidate_config
+from src.candidate.extraction import extraction_pool
+from src.candidate.storage import cv_store
+from src.candidate.text_store import text_store
 from src.candidate.prompts import fn_candidate_analysis, system_prompt_candidate
 from src.utils import LOGGER
-from src.integrations.llm import extract_data_from_llm
+from src.integrations.llm import aextract_data_from_llm
+from src.vocabulary import annotate_ids
 
-async def save_cv_candidate(file):
-    # Prepend the current datetime to the filename
-    file_name = datetime.now().strftime("%Y%m%d%H%M%S-") + file.filename
+def save_cv_candidate(contents, filehash):
+    # Stored once per content under its SHA-256, re-uploads only add a reference
+    return cv_store.put(contents, digest=filehash)
 
-    # Construct the full image path based on the settings
-    image_path = candidate_config.CV_UPLOAD_DIR + file_name
 
-    # Read the contents of the uploaded file asynchronously
-    contents = await file.read()
+def extract_cv_pages(contents, file_name, filehash):
+    # Text extracted before is reused, the parser only runs on new content
+    if candidate_config.CV_TEXT_STORE_ENABLED:
+        pages = text_store.get(filehash)
+        if pages is not None:
+            return pages
 
-    # Write the uploaded contents to the specified image path
-    with open(image_path, "wb") as f:
-        f.write(contents)
+    # Parsed from the uploaded bytes in the extraction process pool under time, page and memory limits
+    pages = extraction_pool.extract(contents, file_name)
 
-    return file_name
+    if candidate_config.CV_TEXT_STORE_ENABLED:
+        text_store.put(filehash, pages)
+    return pages
 
 
-def load_pdf_docx(file_path):
-    # Determine the file type and choose the appropriate loader
-    if os.path.basename(file_path).lower().endswith((".pdf", ".docx")):
-        loader = (
-            PyPDFLoader(file_path)
-            if file_path.lower().endswith(".pdf")
-            else Docx2txtLoader(file_path)
-        )
+def compress_cv_pages(pages, label):
+    # Normalise, strip headers/footers and fit the text to the token budget
+    content, compression = compress_cv_content(pages)
+    LOGGER.info(
+        f"CV {label}: {compression['tokens_before']} -> {compression['tokens_after']} tokens, "
+        f"saved {compression['tokens_saved']}"
+    )
+    return content
 
-    # Load and split the document using the selected loader
-    documents = loader.load_and_split()
 
-    return documents
+def read_cv_candidate(contents, file_name):
+    filehash = hashlib.sha256(contents).hexdigest()
+    pages = extract_cv_pages(contents, file_name, filehash)
+    return compress_cv_pages(pages, file_name), filehash
 
 
-def read_cv_candidate(file_name):
-    file_path = candidate_config.CV_UPLOAD_DIR + file_name
+def read_cv_candidate_by_hash(filehash):
+    """
+    CV text of a file the service has seen before, without its bytes
 
-    documents = load_pdf_docx(file_path=file_path)
-    content = ""
-    for page in documents:
-        content += page.page_content
-    return content
+    Args:
+        filehash (str): SHA-256 of the CV file
+
+    Returns:
+        str: The compressed CV text, None when neither the text nor the file is stored
+    """
+    pages = text_store.get(filehash) if candidate_config.CV_TEXT_STORE_ENABLED else None
+    if pages is None:
+        contents = cv_store.get(filehash)
+        if contents is None:
+            return None
+        pages = extract_cv_pages(contents, "", filehash)
+    return compress_cv_pages(pages, filehash)
 
 
-def analyse_candidate(cv_content):
+async def analyse_candidate(cv_content):
     start = time.time()
     LOGGER.info("Start analyse candidate")
 
-    output_analysis = extract_data_from_llm(cv_content, system_prompt_candidate, fn_candidate_analysis)
-    json_output = output_analysis
+    output_analysis = await aextract_data_from_llm(cv_content, system_prompt_candidate, fn_candidate_analysis)
+    # Canonical skill/degree/certificate IDs next to the raw strings
+    json_output = annotate_ids(output_analysis)
 
     LOGGER.info("Done analyse candidate")
     LOGGER.info(f"Time analyse candidate: {time.time() - start}")
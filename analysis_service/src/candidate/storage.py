@@ -0,0 +1,264 @@
+import argparse
+import fcntl
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from src.candidate.config import candidate_config
+from src.candidate.extractors import sniff_file_type
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+SHARD_PATTERN = re.compile(r"^[0-9a-f]{2}$")
+REFS_SUFFIX = ".refs"
+
+
+def shard_path(root, digest, suffix=""):
+    """Path of a digest under root in two levels of fan-out directories."""
+    if not DIGEST_PATTERN.match(digest):
+        raise ValueError(f"Invalid CV digest: {digest!r}")
+    return os.path.join(root, digest[:2], digest[2:4], digest + suffix)
+
+
+class CVStore:
+    """
+    Content-addressed CV storage.
+
+    Every CV is stored once under its SHA-256 digest in two levels of fan-out
+    directories (ab/cd/abcd...), so no directory grows past a few hundred
+    entries and a lookup by hash is a single stat. Each stored CV carries a
+    reference count in a sidecar file, incremented on every upload and
+    decremented on release. Blobs whose count dropped to zero are deleted by
+    the garbage collector, never inline.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.dedupes = 0
+        self.releases = 0
+
+    def path_for(self, digest):
+        return shard_path(self.root, digest)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @contextmanager
+    def _locked_refs(self, digest):
+        """Lock the sidecar refs file of a blob, creating it when missing."""
+        refs_path = self.path_for(digest) + REFS_SUFFIX
+        os.makedirs(os.path.dirname(refs_path), exist_ok=True)
+        while True:
+            f = open(refs_path, "a+", encoding="utf-8")
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # The collector may have unlinked the file while we waited for the lock
+                if os.fstat(f.fileno()).st_ino == os.stat(refs_path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            f.close()
+
+        try:
+            f.seek(0)
+            yield f
+        finally:
+            f.close()
+
+    @staticmethod
+    def _read_refs(f):
+        try:
+            return int(f.read().strip() or 0)
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _write_refs(f, refs):
+        f.seek(0)
+        f.truncate()
+        f.write(str(refs))
+        f.flush()
+
+    def exists(self, digest):
+        try:
+            os.stat(self.path_for(digest))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _blob_present(self, digest, refs_file):
+        """
+        Check again under the refs lock that the blob exists.
+
+        The collector deletes blobs while holding the same lock, so a blob
+        seen before the lock was taken may be gone. The sidecar that
+        _locked_refs recreated for it is removed again.
+        """
+        if self.exists(digest):
+            return True
+        os.unlink(refs_file.name)
+        return False
+
+    def get(self, digest):
+        """Content of a stored CV, None when the digest is unknown."""
+        try:
+            with open(self.path_for(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def file_type(self, digest):
+        with open(self.path_for(digest), "rb") as f:
+            return sniff_file_type(f.read(1024))
+
+    def put(self, contents, digest=None):
+        """
+        Store a CV and take a reference to it.
+
+        Args:
+            contents (bytes): Content of the CV
+            digest (str): SHA-256 of contents when the caller already has it
+
+        Returns:
+            str: The SHA-256 digest the CV is stored under
+        """
+        digest = digest or hashlib.sha256(contents).hexdigest()
+        path = self.path_for(digest)
+
+        with self._locked_refs(digest) as refs_file:
+            if os.path.exists(path):
+                self._count("dedupes")
+            else:
+                # Write then rename so readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(contents)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                self._count("writes")
+
+            self._write_refs(refs_file, self._read_refs(refs_file) + 1)
+
+        return digest
+
+    def retain(self, digest):
+        """Take one more reference to a stored CV, returns the count or None when unknown."""
+        if not self.exists(digest):
+            return None
+
+        with self._locked_refs(digest) as refs_file:
+            if not self._blob_present(digest, refs_file):
+                return None
+            refs = self._read_refs(refs_file) + 1
+            self._write_refs(refs_file, refs)
+        return refs
+
+    def release(self, digest):
+        """Drop one reference to a CV, returns the remaining count or None when unknown."""
+        if not self.exists(digest):
+            return None
+
+        with self._locked_refs(digest) as refs_file:
+            if not self._blob_present(digest, refs_file):
+                return None
+            refs = max(self._read_refs(refs_file) - 1, 0)
+            self._write_refs(refs_file, refs)
+
+        self._count("releases")
+        return refs
+
+    def iter_digests(self):
+        for shard in os.listdir(self.root):
+            shard_dir = os.path.join(self.root, shard)
+            if not SHARD_PATTERN.match(shard) or not os.path.isdir(shard_dir):
+                continue
+            for subshard in os.listdir(shard_dir):
+                subshard_path = os.path.join(shard_dir, subshard)
+                if not SHARD_PATTERN.match(subshard) or not os.path.isdir(subshard_path):
+                    continue
+                for name in os.listdir(subshard_path):
+                    if DIGEST_PATTERN.match(name):
+                        yield name
+
+    def gc(self, grace_seconds=3600, dry_run=False):
+        """
+        Delete CVs without references.
+
+        Blobs modified within grace_seconds are kept, so a CV stored right
+        before its first reference lands is never collected.
+
+        Returns:
+            dict: Number of blobs scanned, deleted and bytes freed, and the deleted digests
+        """
+        scanned = freed = 0
+        deleted = []
+        now = time.time()
+
+        for digest in self.iter_digests():
+            scanned += 1
+            path = self.path_for(digest)
+            with self._locked_refs(digest) as refs_file:
+                if self._read_refs(refs_file) > 0:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime < grace_seconds:
+                    continue
+
+                deleted.append(digest)
+                freed += stat.st_size
+                if not dry_run:
+                    os.unlink(path)
+                    os.unlink(path + REFS_SUFFIX)
+
+        return {
+            "scanned": scanned,
+            "deleted": len(deleted),
+            "freed_bytes": freed,
+            "dry_run": dry_run,
+            "digests": deleted,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {"writes": self.writes, "dedupes": self.dedupes, "releases": self.releases}
+
+
+cv_store = CVStore(candidate_config.CV_UPLOAD_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed CV storage maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subparsers.add_parser("gc", help="Delete CVs that are no longer referenced")
+    gc_parser.add_argument("--grace-seconds", type=float, default=3600)
+    gc_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "gc":
+        from src.candidate.text_store import text_store
+
+        result = cv_store.gc(grace_seconds=args.grace_seconds, dry_run=args.dry_run)
+        # Extracted text goes with the CV it came from
+        if not args.dry_run:
+            for digest in result["digests"]:
+                text_store.delete(digest)
+        print(
+            f"Scanned {result['scanned']} CVs, {'would delete' if args.dry_run else 'deleted'} "
+            f"{result['deleted']} ({result['freed_bytes']} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import threading
+
+from src.candidate.config import candidate_config
+from src.candidate.storage import shard_path
+
+# Pages are stored joined by a form feed, which extracted text never contains
+PAGE_SEPARATOR = "\f"
+
+
+class ExtractedTextStore:
+    """
+    zstd compressed extracted CV text keyed by the SHA-256 of the file.
+
+    Re-analysing a CV, after a prompt change or when the same file is sent
+    again, reads the text from here and never runs the PDF/DOCX parser.
+    Entries carry CV_TEXT_STORE_VERSION in their name, bump it whenever the
+    extractors or their page/token limits change.
+    """
+
+    def __init__(self, root, version, level):
+        self.root = root
+        self.version = version
+        self.level = level
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _codecs(self):
+        # zstd contexts are not thread safe, keep one pair per thread
+        if not hasattr(self._local, "compressor"):
+            import zstandard
+
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+
+    def path_for(self, digest):
+        return shard_path(self.root, digest, f".v{self.version}.txt.zst")
+
+    def get(self, digest):
+        """Extracted pages of a CV, None when it was never extracted."""
+        try:
+            with open(self.path_for(digest), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+
+        _, decompressor = self._codecs()
+        self._count(hits=1)
+        return decompressor.decompress(data).decode("utf-8").split(PAGE_SEPARATOR)
+
+    def put(self, digest, pages):
+        path = self.path_for(digest)
+        raw = PAGE_SEPARATOR.join(page.replace(PAGE_SEPARATOR, "\n") for page in pages).encode("utf-8")
+        compressor, _ = self._codecs()
+        data = compressor.compress(raw)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._count(writes=1, bytes_raw=len(raw), bytes_stored=len(data))
+
+    def delete(self, digest):
+        try:
+            os.unlink(self.path_for(digest))
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "compression_ratio": self.bytes_raw / self.bytes_stored if self.bytes_stored else 0.0,
+            }
+
+
+text_store = ExtractedTextStore(
+    root=candidate_config.CV_TEXT_STORE_DIR,
+    version=candidate_config.CV_TEXT_STORE_VERSION,
+    level=candidate_config.CV_TEXT_STORE_LEVEL,
+)
@@ -1 +1,4 @@
-from .llm import extract_data_from_llm
\ No newline at end of file
+from .cache import llm_cache
+from .client_pool import client_pool
+from .llm import aextract_data_from_llm
+from .providers import get_provider
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from config import settings
+from src.utils import LOGGER
+
+
+def make_cache_key(text, system_prompt, function_call, model):
+    """
+    Content address of an LLM extraction: hash of the prompt version, model,
+    system prompt, tool schema and input text. Bumping LLM_PROMPT_VERSION
+    invalidates every existing entry.
+    """
+    digest = hashlib.sha256()
+    for part in (
+        settings.LLM_PROMPT_VERSION,
+        model,
+        system_prompt,
+        json.dumps(function_call, sort_keys=True, separators=(",", ":")),
+        text,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def retrieve_exception(task):
+    # Mark as retrieved so a computation without waiters left does not log a warning
+    if not task.cancelled():
+        task.exception()
+
+
+class LLMResultCache:
+    """
+    Two-tier cache of LLM tool outputs with in-flight request coalescing.
+
+    Values are kept as JSON strings so every caller gets its own copy of the
+    result and can mutate it freely. The memory tier is a bounded LRU, the
+    optional disk tier shards entries by key prefix under LLM_CACHE_DIR.
+    """
+
+    def __init__(self, max_entries, cache_dir=""):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._async_inflight = {}
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            LOGGER.warning(f"LLM cache disk read failed: {str(e)}")
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            LOGGER.warning(f"LLM cache disk write failed: {str(e)}")
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits_memory += 1
+                return value
+
+        value = self._read_disk(key)
+        if value is not None:
+            self._remember(key, value)
+            with self._lock:
+                self.hits_disk += 1
+        return value
+
+    def set(self, key, value):
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    async def _compute(self, key, compute):
+        try:
+            value = json.dumps(await compute())
+            self.set(key, value)
+            return value
+        finally:
+            self._async_inflight.pop(key, None)
+
+    async def aget_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            return json.loads(value)
+
+        task = self._async_inflight.get(key)
+        if task is not None:
+            with self._lock:
+                self.coalesced += 1
+        else:
+            # Detached from the first caller, so its cancellation does not fail the callers waiting on the key
+            task = asyncio.get_running_loop().create_task(self._compute(key, compute))
+            task.add_done_callback(retrieve_exception)
+            self._async_inflight[key] = task
+            with self._lock:
+                self.misses += 1
+
+        return json.loads(await asyncio.shield(task))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            hits = self.hits_memory + self.hits_disk
+            lookups = hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.cache_dir),
+                "prompt_version": settings.LLM_PROMPT_VERSION,
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": (hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+llm_cache = LLMResultCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES, cache_dir=settings.LLM_CACHE_DIR
+)
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+
+from config import settings
+
+
+def schema_key(function_call):
+    # Stable fingerprint of a tool schema so equal schemas share one bound client
+    payload = json.dumps(function_call, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class LLMClientPool:
+    """
+    Process-wide registry of connection-pooled LLM clients.
+
+    One HTTP connection pool and chat model is kept per deployment, and one
+    tool-bound runnable per (deployment, tool schema). The registry resets
+    itself in a forked child so uvicorn workers never share sockets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._http_clients = {}
+        self._models = {}
+        self._bound = {}
+        self.hits = 0
+        self.misses = 0
+
+    def after_fork(self):
+        # Connections inherited from the parent must not be reused or closed here
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _limits(self):
+        import httpx
+
+        return httpx.Limits(
+            max_connections=settings.LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_POOL_KEEPALIVE_EXPIRY,
+        )
+
+    def _get_model(self, deployment):
+        model = self._models.get(deployment)
+        if model is None:
+            # Deferred so importing the app does not pay for langchain/openai
+            import httpx
+            from langchain_openai import AzureChatOpenAI
+
+            # Every call goes through ainvoke, only the async client is pooled
+            http_async_client = httpx.AsyncClient(limits=self._limits())
+            self._http_clients[deployment] = http_async_client
+            model = AzureChatOpenAI(
+                azure_deployment=deployment,
+                openai_api_version=settings.AZURE_OPENAI_API_VERSION,
+                azure_endpoint=settings.AZURE_OPENAI_API_BASE,
+                api_key=settings.AZURE_OPENAI_API_KEY,
+                temperature=0.3,
+                # Retries and deadlines are handled by src.integrations.resilience
+                max_retries=0,
+                timeout=settings.LLM_CALL_TIMEOUT,
+                http_async_client=http_async_client,
+            )
+            self._models[deployment] = model
+        return model
+
+    def get(self, function_call, deployment=None):
+        deployment = deployment or settings.AZURE_OPENAI_DEPLOYMENT
+        key = (deployment, schema_key(function_call))
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+
+            llm_with_tools = self._bound.get(key)
+            if llm_with_tools is not None:
+                self.hits += 1
+                return llm_with_tools
+
+            self.misses += 1
+            llm_with_tools = self._get_model(deployment).bind_tools(function_call)
+            self._bound[key] = llm_with_tools
+            return llm_with_tools
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pid": self._pid,
+                "deployments": len(self._models),
+                "bound_clients": len(self._bound),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    async def aclose(self):
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            self._reset()
+        for http_async_client in http_clients:
+            await http_async_client.aclose()
+
+
+client_pool = LLMClientPool()
+
+os.register_at_fork(after_in_child=client_pool.after_fork)
@@ -0,0 +1,14 @@
+class ProviderError(Exception):
+    """The LLM provider failed in a way worth retrying."""
+
+
+class LLMResponseError(ProviderError):
+    """The provider answered without a usable tool call."""
+
+
+class DeadlineExceededError(Exception):
+    """The caller's deadline passed before the LLM call could finish."""
+
+
+class CircuitOpenError(Exception):
+    """The provider is unhealthy, calls fail fast until the breaker resets."""
@@ -1,22 +1,34 @@
-from langchain_openai import AzureChatOpenAI
+from starlette.concurrency import run_in_threadpool
+
 from config import settings
+from src.integrations.cache import llm_cache, make_cache_key
+from src.integrations.providers import get_provider
+from src.integrations.rate_limit import estimate_tokens, rate_limiter
+from src.integrations.resilience import retry_policy
 from src.utils import LOGGER
-import json
 
 
-def extract_data_from_llm(text, system_prompt, function_call):
-    llm = AzureChatOpenAI(
-        azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT,
-        openai_api_version=settings.AZURE_OPENAI_API_VERSION,
-        azure_endpoint=settings.AZURE_OPENAI_API_BASE,
-        api_key=settings.AZURE_OPENAI_API_KEY,
-        temperature=0.3
+async def _ainvoke(provider, text, system_prompt, function_call):
+    async def wait_for_capacity():
+        if rate_limiter.enabled:
+            tokens = await run_in_threadpool(
+                estimate_tokens, text, system_prompt, function_call, provider.model_name
+            )
+            await rate_limiter.aacquire(tokens)
+
+    return await retry_policy.acall(
+        lambda: provider.ainvoke(text, system_prompt, function_call),
+        prepare=wait_for_capacity,
+    )
+
+
+async def aextract_data_from_llm(text, system_prompt, function_call):
+    # Shares the pooled async client of the provider
+    provider = get_provider()
+    if not settings.LLM_CACHE_ENABLED:
+        return await _ainvoke(provider, text, system_prompt, function_call)
+
+    key = make_cache_key(text, system_prompt, function_call, f"{provider.name}:{provider.model_name}")
+    return await llm_cache.aget_or_compute(
+        key, lambda: _ainvoke(provider, text, system_prompt, function_call)
     )
-    llm_with_tools = llm.bind_tools(function_call)
-    response = llm_with_tools.invoke([
-        ("system", system_prompt),
-        ("user", text)
-    ])
-    output = response.additional_kwargs['tool_calls'][0]['function']['arguments']
-    result = json.loads(output)
-    return result
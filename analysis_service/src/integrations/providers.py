@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+
+from config import settings
+from src.integrations.client_pool import client_pool
+from src.integrations.exceptions import LLMResponseError, ProviderError
+from src.integrations.usage import read_usage, usage_stats
+
+
+class AzureOpenAIProvider:
+    """Azure OpenAI chat completions through the pooled, tool-bound clients."""
+
+    name = "azure"
+
+    @property
+    def model_name(self):
+        return settings.AZURE_OPENAI_DEPLOYMENT
+
+    @staticmethod
+    def _build_messages(text, system_prompt):
+        return [
+            ("system", system_prompt),
+            ("user", text)
+        ]
+
+    @staticmethod
+    def _parse_tool_output(response):
+        tool_calls = response.additional_kwargs.get('tool_calls') or []
+        if not tool_calls:
+            raise LLMResponseError("LLM response has no tool call")
+        try:
+            output = tool_calls[0]['function']['arguments']
+            result = json.loads(output)
+        except (KeyError, TypeError, ValueError) as e:
+            raise LLMResponseError(f"LLM response has malformed tool arguments: {str(e)}")
+        if not isinstance(result, dict):
+            raise LLMResponseError("LLM tool arguments are not an object")
+        return result
+
+    async def ainvoke(self, text, system_prompt, function_call):
+        llm_with_tools = client_pool.get(function_call)
+        started = time.monotonic()
+        response = await llm_with_tools.ainvoke(self._build_messages(text, system_prompt))
+        usage_stats.record(*read_usage(response), time.monotonic() - started)
+        return self._parse_tool_output(response)
+
+
+# Candidates of a packed matching prompt, see src/matching/service.py
+PACKED_CANDIDATE = re.compile(r"^Candidate \[(\d+)\]:", re.MULTILINE)
+
+
+class FakeProvider:
+    """
+    Deterministic local stand-in for load testing without Azure.
+
+    Returns schema-valid tool arguments for any function definition. The
+    output depends only on the seed and the prompt, while latency and
+    injected errors follow the configured distribution and error rate.
+    """
+
+    name = "fake"
+    model_name = "fake"
+
+    WORDS = [
+        "python", "sql", "docker", "linux", "react", "java", "analysis",
+        "leadership", "communication", "teamwork", "cloud", "testing",
+        "design", "backend", "frontend", "data", "english", "delivery",
+    ]
+
+    def __init__(
+        self,
+        latency_distribution="lognormal",
+        latency_mean_ms=800.0,
+        latency_stddev_ms=300.0,
+        error_rate=0.0,
+        seed=0,
+    ):
+        self.latency_distribution = latency_distribution
+        self.latency_mean_ms = latency_mean_ms
+        self.latency_stddev_ms = latency_stddev_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    def sample_latency(self):
+        mean, stddev = self.latency_mean_ms, self.latency_stddev_ms
+        if self.latency_distribution == "constant" or mean <= 0:
+            latency = mean
+        elif self.latency_distribution == "uniform":
+            latency = self._rng.uniform(max(mean - stddev, 0), mean + stddev)
+        elif self.latency_distribution == "normal":
+            latency = self._rng.gauss(mean, stddev)
+        elif self.latency_distribution == "lognormal":
+            sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+            latency = self._rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.latency_distribution}")
+        return max(latency, 0) / 1000
+
+    def maybe_fail(self):
+        if self._rng.random() < self.error_rate:
+            raise ProviderError("Fake provider injected error")
+
+    def _fake_value(self, name, schema, rng, candidate_indexes=()):
+        value_type = schema.get("type")
+        if value_type == "object":
+            return {
+                key: self._fake_value(key, value, rng, candidate_indexes)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if value_type == "array":
+            items = schema.get("items", {})
+            # Packed matching expects one evaluation per candidate in the prompt
+            if candidate_indexes and "candidate_index" in items.get("properties", {}):
+                return [
+                    {**self._fake_value(name, items, rng), "candidate_index": index}
+                    for index in candidate_indexes
+                ]
+            return [
+                self._fake_value(name, items, rng, candidate_indexes)
+                for _ in range(rng.randint(1, 4))
+            ]
+        if value_type == "integer":
+            return rng.randint(schema.get("minimum", 0), schema.get("maximum", 10))
+        if value_type == "number":
+            return round(rng.uniform(schema.get("minimum", 0), schema.get("maximum", 10)), 2)
+        if value_type == "boolean":
+            return rng.random() < 0.5
+        if name == "email":
+            return f"candidate{rng.randint(1, 99999)}@example.com"
+        if name == "phone_number":
+            return str(rng.randint(6000000000, 9999999999))
+        if name == "candidate_name":
+            return f"Candidate {rng.randint(1, 99999)}"
+        return " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(2, 8)))
+
+    def generate(self, text, system_prompt, function_call):
+        digest = hashlib.sha256(f"{self.seed}\0{system_prompt}\0{text}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+        candidate_indexes = [int(index) for index in PACKED_CANDIDATE.findall(text)]
+        return self._fake_value(None, function_call[0]["parameters"], rng, candidate_indexes)
+
+    async def ainvoke(self, text, system_prompt, function_call):
+        await asyncio.sleep(self.sample_latency())
+        self.maybe_fail()
+        return self.generate(text, system_prompt, function_call)
+
+
+_provider = None
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        if settings.LLM_PROVIDER == "azure":
+            _provider = AzureOpenAIProvider()
+        elif settings.LLM_PROVIDER == "fake":
+            _provider = FakeProvider(
+                latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+                latency_mean_ms=settings.FAKE_LLM_LATENCY_MEAN_MS,
+                latency_stddev_ms=settings.FAKE_LLM_LATENCY_STDDEV_MS,
+                error_rate=settings.FAKE_LLM_ERROR_RATE,
+                seed=settings.FAKE_LLM_SEED,
+            )
+        else:
+            raise ValueError(f"Unknown LLM provider: {settings.LLM_PROVIDER}")
+    return _provider
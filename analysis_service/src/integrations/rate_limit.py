@@ -0,0 +1,186 @@
+import asyncio
+import fcntl
+import json
+import os
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from src.integrations.tokenizer import count_tokens
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def estimate_tokens(text, system_prompt, function_call, model_name):
+    # Prompt tokens counted with tiktoken plus a fixed reserve for the completion
+    prompt = system_prompt + text + json.dumps(function_call, separators=(",", ":"))
+    return count_tokens(prompt, model_name) + settings.LLM_RATE_LIMIT_OUTPUT_TOKENS
+
+
+class TokenBucketRateLimiter:
+    """
+    Outbound limiter for provider requests per minute and tokens per minute.
+
+    Both buckets live in a small JSON state file guarded by flock, so every
+    uvicorn worker on the host draws from the same quota. Callers that find
+    the buckets empty are queued: they sleep until enough capacity refills
+    instead of failing.
+    """
+
+    def __init__(self, rpm, tpm, state_file, max_sleep=1.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.state_file = state_file
+        self.max_sleep = max_sleep
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._waiting = 0
+        self.acquired = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    @property
+    def enabled(self):
+        return self.rpm > 0 or self.tpm > 0
+
+    def _update_state(self, update):
+        with open(self.state_file, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            raw = f.read()
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                state = {}
+
+            result = update(state)
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+            return result
+
+    def _try_acquire(self, tokens):
+        """Take capacity if available, otherwise return the seconds to wait."""
+        pid = str(os.getpid())
+
+        def update(state):
+            now = time.time()
+            elapsed = max(now - state.get("updated", now), 0)
+            state["updated"] = now
+
+            rpm_level = min(self.rpm, state.get("rpm", self.rpm) + elapsed * self.rpm / 60)
+            tpm_level = min(self.tpm, state.get("tpm", self.tpm) + elapsed * self.tpm / 60)
+            needed_tokens = min(tokens, self.tpm)
+
+            waits = []
+            if self.rpm > 0 and rpm_level < 1:
+                waits.append((1 - rpm_level) * 60 / self.rpm)
+            if self.tpm > 0 and tpm_level < needed_tokens:
+                waits.append((needed_tokens - tpm_level) * 60 / self.tpm)
+
+            wait = max(waits, default=0.0)
+            if not wait:
+                rpm_level -= 1 if self.rpm > 0 else 0
+                tpm_level -= needed_tokens if self.tpm > 0 else 0
+
+            state["rpm"] = rpm_level
+            state["tpm"] = tpm_level
+
+            # Queue depth of every live worker, this caller leaves the queue once it acquires
+            with self._lock:
+                waiting = self._waiting - (0 if wait else 1)
+            waiters = {
+                key: value
+                for key, value in state.get("waiters", {}).items()
+                if key != pid and _pid_alive(int(key))
+            }
+            if waiting:
+                waiters[pid] = waiting
+            state["waiters"] = waiters
+            return wait
+
+        return self._update_state(update)
+
+    def _enter(self):
+        with self._lock:
+            self._waiting += 1
+        return time.monotonic()
+
+    def _leave(self, started, queued):
+        waited = time.monotonic() - started
+        with self._lock:
+            self._waiting -= 1
+            self.acquired += 1
+            self.queued += int(queued)
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    async def aacquire(self, tokens):
+        if not self.enabled:
+            return
+        started = self._enter()
+        queued = False
+        try:
+            while True:
+                # The state file is read and written under flock, keep that off the event loop
+                wait = await run_in_threadpool(self._try_acquire, tokens)
+                if not wait:
+                    break
+                queued = True
+                await asyncio.sleep(min(wait, self.max_sleep))
+        finally:
+            self._leave(started, queued)
+
+    def shared_queue_depth(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                state = json.loads(f.read() or "{}")
+        except (OSError, ValueError):
+            return 0
+        return sum(
+            value for key, value in state.get("waiters", {}).items() if _pid_alive(int(key))
+        )
+
+    def stats(self):
+        shared_queue_depth = self.shared_queue_depth() if self.enabled else 0
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "queue_depth": self._waiting,
+                "shared_queue_depth": shared_queue_depth,
+                "acquired": self.acquired,
+                "queued": self.queued,
+                "total_wait_seconds": self.total_wait,
+                "avg_wait_seconds": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait_seconds": self.max_wait,
+            }
+
+
+rate_limiter = TokenBucketRateLimiter(
+    rpm=settings.LLM_RATE_LIMIT_RPM,
+    tpm=settings.LLM_RATE_LIMIT_TPM,
+    state_file=settings.LLM_RATE_LIMIT_STATE_FILE,
+)
+
+os.register_at_fork(after_in_child=rate_limiter.after_fork)
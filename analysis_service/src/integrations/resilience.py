@@ -0,0 +1,266 @@
+import asyncio
+import contextvars
+import random
+import threading
+import time
+
+from config import settings
+from src.integrations.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    ProviderError,
+)
+from src.utils import LOGGER
+
+DEADLINE_HEADER = b"x-request-deadline-ms"
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Absolute time.monotonic() deadline of the current request, None when unbounded
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineMiddleware:
+    """
+    Read the caller's remaining time budget from X-Request-Deadline-Ms.
+
+    The budget is relative so clock skew between hosts does not matter. It
+    is stored as an absolute monotonic deadline in a context variable that
+    every LLM call of the request checks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = None
+        for name, value in scope["headers"]:
+            if name == DEADLINE_HEADER:
+                try:
+                    deadline = time.monotonic() + float(value) / 1000
+                except ValueError:
+                    LOGGER.warning(f"Invalid deadline header: {value!r}")
+                break
+
+        token = request_deadline.set(deadline)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
+
+
+def remaining_time():
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def is_retryable(error):
+    if isinstance(error, (ProviderError, asyncio.TimeoutError, TimeoutError)):
+        return True
+
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def retry_after(error):
+    # Honour the provider's Retry-After on throttling responses
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the provider is unhealthy.
+
+    After `failure_threshold` consecutive retryable failures the breaker opens
+    and rejects calls for `reset_timeout` seconds, then lets a single trial
+    call through (half-open). A success closes it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError("LLM provider circuit is open")
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self.trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError("LLM provider circuit is half-open, trial call in flight")
+                self.trial_in_flight = True
+
+    def release(self):
+        # The call ended without telling anything about provider health
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                    LOGGER.warning("LLM provider circuit opened")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for retryable LLM errors, bounded by the request deadline."""
+
+    def __init__(self, max_attempts, base_delay, max_delay, breaker):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.timeouts = 0
+        self.deadline_exceeded = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def backoff(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        hinted = retry_after(error)
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+
+        remaining = remaining_time()
+        if remaining is not None and remaining <= delay:
+            self._count("deadline_exceeded")
+            raise DeadlineExceededError("Request deadline exceeded while retrying the LLM call") from error
+        return delay
+
+    def attempt_timeout(self):
+        # Per-attempt timeout, never past the request deadline
+        remaining = remaining_time()
+        if remaining is None:
+            return settings.LLM_CALL_TIMEOUT
+        if remaining <= 0:
+            self._count("deadline_exceeded")
+            raise DeadlineExceededError("Request deadline exceeded before calling the LLM")
+        return min(settings.LLM_CALL_TIMEOUT, remaining)
+
+    def _on_failure(self, attempt, error):
+        """Record a failed attempt and return the delay before the next one."""
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            self._count("timeouts")
+        if not is_retryable(error):
+            self.breaker.release()
+            raise error
+
+        self.breaker.record_failure()
+        if attempt + 1 >= self.max_attempts or self.breaker.state == CircuitBreaker.OPEN:
+            self._count("exhausted")
+            raise error
+
+        self._count("retries")
+        delay = self.backoff(attempt, error)
+        LOGGER.warning(f"LLM call failed ({type(error).__name__}: {str(error)}), retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    async def acall(self, fn, prepare=None):
+        """
+        Run fn with retries and a per-attempt timeout. prepare runs before
+        each attempt outside the attempt timeout, e.g. to wait for rate limit
+        capacity.
+        """
+        self._count("calls")
+        for attempt in range(self.max_attempts):
+            self.breaker.before_call()
+            try:
+                if prepare is not None:
+                    await prepare()
+                timeout = self.attempt_timeout()
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            try:
+                result = await asyncio.wait_for(fn(), timeout=timeout)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._on_failure(attempt, e))
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "deadline_exceeded": self.deadline_exceeded,
+                "breaker": self.breaker.stats(),
+            }
+
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+)
+
+retry_policy = RetryPolicy(
+    max_attempts=settings.LLM_RETRY_ATTEMPTS,
+    base_delay=settings.LLM_RETRY_BASE_DELAY,
+    max_delay=settings.LLM_RETRY_MAX_DELAY,
+    breaker=circuit_breaker,
+)
@@ -0,0 +1,71 @@
+import threading
+
+
+def read_usage(response):
+    """
+    Prompt, cached prompt and completion tokens reported for a chat response.
+
+    Reads langchain's usage_metadata when present, else the raw OpenAI
+    token_usage. Providers that report no usage give zeros.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage:
+        details = usage.get("input_token_details") or {}
+        return usage.get("input_tokens", 0), details.get("cache_read") or 0, usage.get("output_tokens", 0)
+
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        details.get("cached_tokens") or 0,
+        token_usage.get("completion_tokens", 0),
+    )
+
+
+class UsageStats:
+    """
+    Token usage of provider calls, split by prompt prefix cache hit.
+
+    A call counts as a cache hit when the provider reports cached prompt
+    tokens, so the latency of hits and misses can be compared directly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hits = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+
+    def record(self, prompt_tokens, cached_tokens, completion_tokens, seconds):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.completion_tokens += completion_tokens
+            if cached_tokens:
+                self.cache_hits += 1
+                self.hit_seconds += seconds
+            else:
+                self.miss_seconds += seconds
+
+    def stats(self):
+        with self._lock:
+            misses = self.calls - self.cache_hits
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cached_token_ratio": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+                "prefix_cache_hits": self.cache_hits,
+                "prefix_cache_hit_rate": self.cache_hits / self.calls if self.calls else 0.0,
+                "avg_seconds_cache_hit": self.hit_seconds / self.cache_hits if self.cache_hits else 0.0,
+                "avg_seconds_cache_miss": self.miss_seconds / misses if misses else 0.0,
+            }
+
+
+usage_stats = UsageStats()
@@ -8,6 +8,6 @@ router = APIRouter()
 # @router.post("/analyse", response_model=ResponseSchema)
 @router.post("/analyse")
 async def analyse_job(job_data: JobSchema):
-    result = service.analyse_job(job_data=job_data)
+    result = await service.analyse_job(job_data=job_data)
 
     return result
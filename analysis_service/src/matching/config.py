@@ -4,5 +4,21 @@ from pydantic_settings import BaseSettings
 class MachingConfig(BaseSettings):
     MODEL_NAME: str = "gpt-3.5-turbo-16k"
 
+    # Max LLM calls in flight for one /analyse-batch request
+    BATCH_CONCURRENCY: int = 8
+    BATCH_MAX_CONCURRENCY: int = 32
+
+    # Packed mode: several candidates scored in one tool call
+    PACK_TOKEN_BUDGET: int = 12000
+    PACK_MAX_CANDIDATES: int = 8
+    PACK_OUTPUT_TOKENS_PER_CANDIDATE: int = 400
+
+    # Count the tokens the compact prompt layout saves, shown in /metrics.
+    # Tokenizes the str() of every candidate, leave off outside of measurements.
+    PROMPT_TOKEN_STATS: bool = False
+
+    # Registered job contexts kept in memory, evicted keys must be registered again
+    JOB_CONTEXT_MAX_ENTRIES: int = 256
+
 
 matching_config = MachingConfig()
@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.integrations.tokenizer import count_tokens
+from src.matching.config import matching_config
+from src.matching.prompts import system_prompt_matching, system_prompt_matching_packed
+from src.matching.serializer import serialize_profile
+
+
+class JobContext:
+    """
+    Compacted requirement of one job version.
+
+    The system prompts are built once here, so every matching call for the
+    job sends the same bytes before the candidate block and the provider can
+    reuse its cached prompt prefix.
+    """
+
+    __slots__ = (
+        "key",
+        "job_id",
+        "content_hash",
+        "requirement",
+        "legacy",
+        "system_prompt",
+        "system_prompt_packed",
+        "_job_tokens",
+    )
+
+    def __init__(self, job_id, job):
+        self.job_id = str(job_id)
+        self.requirement = serialize_profile(job)
+        self.content_hash = hashlib.sha256(self.requirement.encode("utf-8")).hexdigest()[:16]
+        self.key = f"{self.job_id}:{self.content_hash}"
+        # What the previous prompt sent for this job, kept for prompt_stats
+        self.legacy = str(job)
+        block = "\nRequirement:\n" + self.requirement
+        self.system_prompt = system_prompt_matching + block
+        self.system_prompt_packed = system_prompt_matching_packed + block
+        self._job_tokens = None
+
+    def job_tokens(self, model_name):
+        """Tokens of the job block in the str() and compact layouts, counted once per context."""
+        if self._job_tokens is None:
+            self._job_tokens = (
+                count_tokens("\nRequirement:" + self.legacy, model_name),
+                count_tokens("\nRequirement:\n" + self.requirement, model_name),
+            )
+        return self._job_tokens
+
+
+class JobContextStore:
+    """
+    Bounded LRU of registered job contexts, keyed by "job_id:content_hash".
+
+    A job edited after registration gets a new key, so a stale key never
+    scores against a newer requirement. Evicted or unknown keys are reported
+    to the caller, which registers the job again.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.registrations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, job_id, job):
+        context = JobContext(job_id, job)
+        with self._lock:
+            self.registrations += 1
+            # Keep the existing object so its prompts stay byte-identical
+            context = self._entries.get(context.key, context)
+            self._entries[context.key] = context
+            self._entries.move_to_end(context.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return context
+
+    def get(self, key):
+        with self._lock:
+            context = self._entries.get(key)
+            if context is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return context
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "registrations": self.registrations,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+job_contexts = JobContextStore(matching_config.JOB_CONTEXT_MAX_ENTRIES)
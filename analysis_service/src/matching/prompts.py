@@ -1,3 +1,5 @@
+import copy
+
 system_prompt_matching = """
 Scoring Guide:
 It's ok to say candidate does not match the requirement.
@@ -130,3 +132,44 @@ fn_matching_analysis = [
         },
     }
 ]
+
+system_prompt_matching_packed = (
+    system_prompt_matching
+    + """Several candidates are given, each introduced as "Candidate [index]".
+Evaluate every candidate independently against the requirement, never compare candidates with each other.
+Return exactly one evaluation per candidate with its candidate_index.
+"""
+)
+
+
+def _build_packed_function(function_call):
+    # Array-valued variant of the single-candidate tool: one evaluation per candidate
+    evaluation = copy.deepcopy(function_call[0]["parameters"])
+    evaluation["properties"] = {
+        "candidate_index": {
+            "type": "integer",
+            "description": "Index of the evaluated candidate, as given in Candidate [index].",
+        },
+        **evaluation["properties"],
+    }
+    evaluation["required"] = ["candidate_index"] + evaluation["required"]
+
+    return [
+        {
+            "name": "evaluate_candidates",
+            "description": function_call[0]["description"] + " Do it for every candidate.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "evaluations": {
+                        "type": "array",
+                        "items": evaluation,
+                    },
+                },
+                "required": ["evaluations"],
+            },
+        }
+    ]
+
+
+fn_matching_analysis_packed = _build_packed_function(fn_matching_analysis)
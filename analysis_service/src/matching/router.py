@@ -1,13 +1,46 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from src.matching import service
-from src.matching.schemas import MatchingSchema
+from src.matching.job_context import job_contexts
+from src.matching.schemas import JobContextSchema, MatchingBatchSchema, MatchingSchema
 
 router = APIRouter()
 
 
+def get_job_context(data):
+    context = service.resolve_job_context(job=data.job, job_key=data.job_key)
+    if context is None:
+        # Evicted or registered on another instance, the caller registers the job again
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job context not registered")
+    return context
+
+
+@router.post("/jobs")
+async def register_job(job_data: JobContextSchema):
+    context = job_contexts.register(job_data.job_id, job_data.job)
+
+    return {"job_key": context.key, "content_hash": context.content_hash}
+
+
 # @router.post("/analyse", response_model=ResponseSchema)
 @router.post("/analyse")
 async def analyse_matching(matching_data: MatchingSchema):
-    result = service.analyse_matching(matching_data=matching_data)
+    context = get_job_context(matching_data)
+    result = await service.analyse_matching(context=context, candidate=matching_data.candidate)
 
     return result
+
+
+@router.post("/analyse-batch")
+async def analyse_matching_batch(batch_data: MatchingBatchSchema):
+    context = get_job_context(batch_data)
+    # Stream one NDJSON line per candidate as each score lands
+    return StreamingResponse(
+        service.analyse_matching_batch(
+            context=context,
+            candidates=batch_data.candidates,
+            concurrency=batch_data.concurrency,
+            packed=batch_data.packed,
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -1,11 +1,35 @@
-from pydantic import BaseModel
+from typing import Optional
 
+from pydantic import BaseModel, model_validator
 
-class MatchingSchema(BaseModel):
-    candidate: dict
+
+class JobContextSchema(BaseModel):
+    job_id: str
     job: dict
 
 
+class JobReferenceSchema(BaseModel):
+    # Either a job_key from POST /matching/jobs or the whole job document
+    job: Optional[dict] = None
+    job_key: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_job(self):
+        if self.job is None and not self.job_key:
+            raise ValueError("Send a job or a job_key")
+        return self
+
+
+class MatchingSchema(JobReferenceSchema):
+    candidate: dict
+
+
+class MatchingBatchSchema(JobReferenceSchema):
+    candidates: list[dict]
+    concurrency: Optional[int] = None
+    packed: bool = False
+
+
 class ResponseSchema(BaseModel):
     degree: list
     experience: list
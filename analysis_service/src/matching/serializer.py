@@ -0,0 +1,89 @@
+import re
+import threading
+
+from src.integrations.tokenizer import count_tokens
+
+# Sections the scoring rubric looks at, in prompt order
+SCORING_FIELDS = (
+    "degree",
+    "experience",
+    "technical_skill",
+    "responsibility",
+    "certificate",
+    "soft_skill",
+)
+
+ITEM_SEPARATOR = "; "
+EMPTY_SECTION = "none"
+WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def _items(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        values = value
+    else:
+        values = [value]
+
+    items, seen = [], set()
+    for item in values:
+        # The separator must not appear inside an item
+        text = WHITESPACE_RUN.sub(" ", str(item)).replace(ITEM_SEPARATOR, ", ").strip(" ;")
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            items.append(text)
+    return items
+
+
+def serialize_profile(document):
+    """
+    Compact prompt block of a job requirement or a candidate.
+
+    Only the rubric sections are written, one line per section in
+    SCORING_FIELDS order, so ids, file hashes, contact details and
+    timestamps never reach the model. The same document always gives the
+    same bytes, whatever the key order of the stored document.
+
+    Args:
+        document (dict): Analysed job or candidate
+
+    Returns:
+        str: Lines of "section: item; item"
+    """
+    lines = []
+    for field in SCORING_FIELDS:
+        items = _items(document.get(field))
+        lines.append(f"{field}: {ITEM_SEPARATOR.join(items) if items else EMPTY_SECTION}")
+    return "\n".join(lines)
+
+
+class PromptStats:
+    """Tokens sent in matching prompts, against what str() of the documents would have cost."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def record(self, tokens_before, tokens_after):
+        with self._lock:
+            self.calls += 1
+            self.tokens_before += tokens_before
+            self.tokens_after += tokens_after
+        return tokens_before - tokens_after
+
+    def stats(self):
+        with self._lock:
+            saved = self.tokens_before - self.tokens_after
+            return {
+                "calls": self.calls,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "tokens_saved": saved,
+                "avg_tokens_saved": saved / self.calls if self.calls else 0.0,
+            }
+
+
+prompt_stats = PromptStats()
@@ -1,26 +1,48 @@
+import asyncio
+import json
 import time
 
-from src.matching.prompts import fn_matching_analysis, system_prompt_matching
+from src.matching.config import matching_config
+from src.matching.job_context import job_contexts
+from src.matching.prompts import fn_matching_analysis, fn_matching_analysis_packed
+from src.matching.serializer import SCORING_FIELDS, prompt_stats, serialize_profile
 from src.utils import LOGGER
-from src.integrations.llm import extract_data_from_llm
+from src.integrations.llm import aextract_data_from_llm
+from src.integrations.tokenizer import count_tokens
 
 
-
-def generate_content(job, candidate):
-    content = "\nRequirement:" + str(job) + "\nCandidate:" + str(candidate)
+def generate_content(candidate):
+    # The requirement lives in the system prompt of the job context, only the candidate varies
+    content = "\nCandidate:\n" + serialize_profile(candidate)
     return content
 
 
-def analyse_matching(matching_data):
-    start = time.time()
-    LOGGER.info("Start analyse matching")
+def measure_prompt(context, legacy_candidates, content):
+    """Record the tokens the compact layout saved over the str() of the documents."""
+    if not matching_config.PROMPT_TOKEN_STATS:
+        return
+    model_name = matching_config.MODEL_NAME
+    legacy_job_tokens, job_tokens = context.job_tokens(model_name)
+    saved = prompt_stats.record(
+        legacy_job_tokens + count_tokens(legacy_candidates, model_name),
+        job_tokens + count_tokens(content, model_name),
+    )
+    LOGGER.debug(f"Matching prompt saved {saved} tokens")
+
 
-    content = generate_content(job=matching_data.job, candidate=matching_data.candidate)
+def resolve_job_context(job=None, job_key=None):
+    """
+    Job context of a matching request, None when job_key is not registered.
 
-    output_analysis = extract_data_from_llm(content, system_prompt_matching, fn_matching_analysis)
+    An inline job is registered on the fly, so callers that still send the
+    whole job share the same byte-stable prompt prefix.
+    """
+    if job_key:
+        return job_contexts.get(job_key)
+    return job_contexts.register(job.get("_id", ""), job)
 
-    json_output = output_analysis
 
+def calculate_score(json_output):
     # Extract scores and store them in a list
     weights = {
         "degree": 0.1,  # The importance of the candidate's degree
@@ -34,15 +56,168 @@ def analyse_matching(matching_data):
     weighted_score = 0
 
     for section in json_output:
-        if section != "summary_comment":
+        if section in weights:
             weighted_score += int(json_output[section]["score"]) * weights[section]
             total_weight += weights[section]
 
-    final_score = weighted_score / total_weight
+    return weighted_score / total_weight
+
+
+async def score_candidate(context, candidate):
+    content = generate_content(candidate=candidate)
+    measure_prompt(context, "\nCandidate:" + str(candidate), content)
+
+    json_output = await aextract_data_from_llm(content, context.system_prompt, fn_matching_analysis)
+
+    json_output["score"] = calculate_score(json_output)
+
+    return json_output
+
+
+def compact_candidate(candidate):
+    return {field: candidate.get(field, []) for field in SCORING_FIELDS}
+
+
+def generate_packed_content(pack):
+    content = ""
+    for index, candidate in pack:
+        content += f"\nCandidate [{index}]:\n" + serialize_profile(candidate)
+    return content
+
+
+def pack_candidates(context, indexed_candidates):
+    """
+    Group candidates into packs that fit the token budget of one matching call.
+
+    The fixed cost is the packed system prompt plus the job requirement, every
+    candidate adds its compact block and a reserve for its evaluation output.
+    A pack always holds at least one candidate.
+    """
+    model_name = matching_config.MODEL_NAME
+    fixed_tokens = count_tokens(context.system_prompt_packed, model_name)
+    budget = matching_config.PACK_TOKEN_BUDGET - fixed_tokens
+
+    packs = []
+    pack, pack_tokens = [], 0
+    for index, candidate in indexed_candidates:
+        candidate_tokens = (
+            count_tokens(f"\nCandidate [{index}]:\n" + serialize_profile(candidate), model_name)
+            + matching_config.PACK_OUTPUT_TOKENS_PER_CANDIDATE
+        )
+        if pack and (
+            pack_tokens + candidate_tokens > budget
+            or len(pack) >= matching_config.PACK_MAX_CANDIDATES
+        ):
+            packs.append(pack)
+            pack, pack_tokens = [], 0
+        pack.append((index, candidate))
+        pack_tokens += candidate_tokens
+
+    if pack:
+        packs.append(pack)
+    return packs
 
-    json_output["score"] = final_score
+
+async def score_packed_candidates(context, pack):
+    """
+    Score a pack of candidates in one tool call.
+
+    Returns a dict of candidate index -> evaluation in the same shape as
+    score_candidate. Candidates the model skipped are scored on their own.
+    """
+    content = generate_packed_content(pack=pack)
+    measure_prompt(
+        context,
+        "".join(f"\nCandidate [{index}]:" + str(compact_candidate(candidate)) for index, candidate in pack),
+        content,
+    )
+
+    output = await aextract_data_from_llm(content, context.system_prompt_packed, fn_matching_analysis_packed)
+
+    results = {}
+    pack_indexes = {index for index, _ in pack}
+    for evaluation in output.get("evaluations", []):
+        index = evaluation.pop("candidate_index", None)
+        if index in pack_indexes and index not in results:
+            evaluation["score"] = calculate_score(evaluation)
+            results[index] = evaluation
+
+    for index, candidate in pack:
+        if index not in results:
+            LOGGER.warning(f"Packed matching missed candidate {index}, scoring it alone")
+            results[index] = await score_candidate(context=context, candidate=candidate)
+
+    return results
+
+
+async def analyse_matching(context, candidate):
+    start = time.time()
+    LOGGER.info(f"Start analyse matching for job {context.key}")
+
+    json_output = await score_candidate(context=context, candidate=candidate)
 
     LOGGER.info("Done analyse matching")
     LOGGER.info(f"Time analyse matching: {time.time() - start}")
 
     return json_output
+
+
+async def analyse_matching_batch(context, candidates, concurrency=None, packed=False):
+    """
+    Score one job against many candidates with bounded concurrency.
+
+    Yields one NDJSON line per candidate as soon as its score is ready, so the
+    output order follows completion order. Each line carries the candidate's
+    index in the request and its "_id" so the caller can map results back.
+    In packed mode several candidates share one LLM call.
+    """
+    start = time.time()
+    LOGGER.info(f"Start analyse matching batch for job {context.key}: {len(candidates)} candidates")
+
+    concurrency = min(
+        concurrency or matching_config.BATCH_CONCURRENCY,
+        matching_config.BATCH_MAX_CONCURRENCY,
+    )
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    indexed_candidates = list(enumerate(candidates))
+    if packed:
+        packs = pack_candidates(context, indexed_candidates)
+        LOGGER.info(f"Packed {len(candidates)} candidates into {len(packs)} calls")
+    else:
+        packs = [[item] for item in indexed_candidates]
+
+    async def score(pack):
+        items = [
+            {"index": index, "candidate_id": candidate.get("_id")}
+            for index, candidate in pack
+        ]
+        async with semaphore:
+            try:
+                if len(pack) > 1:
+                    results = await score_packed_candidates(context=context, pack=pack)
+                else:
+                    index, candidate = pack[0]
+                    results = {index: await score_candidate(context=context, candidate=candidate)}
+                for item in items:
+                    item["result"] = results[item["index"]]
+                    item["status"] = "ok"
+            except Exception as e:
+                LOGGER.error(f"Fail to analyse matching for candidates {[item['index'] for item in items]}: {str(e)}")
+                for item in items:
+                    item["status"] = "error"
+                    item["detail"] = str(e)
+        return items
+
+    tasks = [asyncio.create_task(score(pack)) for pack in packs]
+    try:
+        for task in asyncio.as_completed(tasks):
+            for item in await task:
+                yield json.dumps(item, default=str) + "\n"
+    finally:
+        # Client went away or the batch finished, drop anything still queued
+        for task in tasks:
+            task.cancel()
+
+    LOGGER.info("Done analyse matching batch")
+    LOGGER.info(f"Time analyse matching batch: {time.time() - start}")
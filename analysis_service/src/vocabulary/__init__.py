@@ -0,0 +1,7 @@
+from .service import (
+    FIELD_VOCABULARIES,
+    annotate_ids,
+    certificate_vocabulary,
+    degree_vocabulary,
+    skill_vocabulary,
+)
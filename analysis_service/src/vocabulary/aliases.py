@@ -0,0 +1,159 @@
+# Canonical terms and their aliases, per kind.
+#
+# The position of a canonical term is its ID, and IDs are stored with the
+# analysed documents, so only ever append new entries at the end of a table.
+# Aliases are written naturally, they go through the same normalisation as
+# the extracted strings.
+
+SKILL_ALIASES = [
+    ("Python", ["python3", "py"]),
+    ("Java", ["java se", "java ee", "core java"]),
+    ("JavaScript", ["js", "ecmascript", "es6", "vanilla js"]),
+    ("TypeScript", ["ts"]),
+    ("C", ["c language", "ansi c"]),
+    ("C++", ["cpp", "c plus plus"]),
+    ("C#", ["csharp", "c sharp"]),
+    (".NET", ["dotnet", "dot net", ".net core", "asp.net", "asp.net core"]),
+    ("Go", ["golang"]),
+    ("Rust", []),
+    ("PHP", []),
+    ("Ruby", []),
+    ("Kotlin", []),
+    ("Swift", []),
+    ("Scala", []),
+    ("R", ["r language", "r programming"]),
+    ("SQL", ["structured query language", "t-sql", "pl/sql"]),
+    ("MySQL", []),
+    ("PostgreSQL", ["postgres", "psql"]),
+    ("MongoDB", ["mongo"]),
+    ("Redis", []),
+    ("Oracle Database", ["oracle", "oracle db"]),
+    ("Microsoft SQL Server", ["sql server", "mssql", "ms sql"]),
+    ("Elasticsearch", ["elastic search", "elk"]),
+    ("HTML", ["html5"]),
+    ("CSS", ["css3"]),
+    ("React", ["reactjs", "react.js", "react js"]),
+    ("React Native", []),
+    ("Angular", ["angularjs", "angular.js", "angular js"]),
+    ("Vue.js", ["vue", "vuejs", "vue js"]),
+    ("Next.js", ["nextjs", "next"]),
+    ("Node.js", ["node", "nodejs", "node js"]),
+    ("Express", ["expressjs", "express.js"]),
+    ("Django", []),
+    ("Flask", []),
+    ("FastAPI", ["fast api"]),
+    ("Spring", ["spring boot", "springboot", "spring framework"]),
+    ("Laravel", []),
+    ("REST API", ["rest", "restful", "restful api", "rest apis", "restful apis"]),
+    ("GraphQL", []),
+    ("Git", ["github", "gitlab", "version control"]),
+    ("Docker", ["containers", "containerization"]),
+    ("Kubernetes", ["k8s"]),
+    ("Linux", ["unix", "ubuntu", "centos"]),
+    ("AWS", ["amazon web services"]),
+    ("Microsoft Azure", ["azure"]),
+    ("Google Cloud", ["gcp", "google cloud platform"]),
+    ("CI/CD", ["ci cd", "continuous integration", "continuous delivery", "jenkins"]),
+    ("Terraform", []),
+    ("Machine Learning", ["ml"]),
+    ("Deep Learning", ["dl"]),
+    ("Natural Language Processing", ["nlp"]),
+    ("Computer Vision", ["cv"]),
+    ("TensorFlow", ["tensor flow"]),
+    ("PyTorch", ["torch"]),
+    ("scikit-learn", ["sklearn", "scikit learn"]),
+    ("Pandas", []),
+    ("NumPy", []),
+    ("Apache Spark", ["spark", "pyspark"]),
+    ("Hadoop", []),
+    ("Power BI", ["powerbi"]),
+    ("Tableau", []),
+    ("Microsoft Excel", ["excel", "ms excel"]),
+    ("Microsoft Office", ["ms office", "office"]),
+    ("Selenium", []),
+    ("Unit Testing", ["junit", "pytest", "unittest"]),
+    ("Agile", ["scrum", "kanban"]),
+    ("Android", ["android development"]),
+    ("iOS", ["ios development"]),
+]
+
+DEGREE_ALIASES = [
+    ("Bachelor", ["undergraduate degree", "graduate"]),
+    ("Bachelor Computer Science", ["bachelor computer engineering", "bachelor cse"]),
+    ("Bachelor Information Technology", ["bachelor it"]),
+    ("Bachelor Electronics", ["bachelor ece", "bachelor electronics communication"]),
+    ("Bachelor Electrical Engineering", ["bachelor eee", "bachelor electrical"]),
+    ("Bachelor Mechanical Engineering", ["bachelor mechanical"]),
+    ("Bachelor Commerce", ["bcom"]),
+    ("Bachelor Business Administration", ["bba"]),
+    ("Bachelor Computer Applications", ["bca"]),
+    ("Master", ["postgraduate degree", "post graduate"]),
+    ("Master Computer Science", ["master computer engineering", "master cse"]),
+    ("Master Information Technology", ["master it"]),
+    ("Master Business Administration", ["mba"]),
+    ("Master Computer Applications", ["mca"]),
+    ("Master Data Science", []),
+    ("PhD", ["doctorate", "doctoral degree"]),
+    ("Diploma", []),
+]
+
+CERTIFICATE_ALIASES = [
+    ("AWS Certified Solutions Architect", ["aws solutions architect", "aws saa"]),
+    ("AWS Certified Developer", ["aws developer associate"]),
+    ("AWS Certified Cloud Practitioner", ["aws cloud practitioner"]),
+    ("Microsoft Certified Azure Fundamentals", ["az-900", "az 900", "azure fundamentals"]),
+    ("Microsoft Certified Azure Administrator", ["az-104", "az 104", "azure administrator"]),
+    ("Google Cloud Professional Cloud Architect", ["gcp professional cloud architect"]),
+    ("Certified Kubernetes Administrator", ["cka"]),
+    ("CompTIA Security+", ["security+", "comptia security plus", "security plus"]),
+    ("CompTIA Network+", ["network+", "comptia network plus"]),
+    ("CompTIA A+", ["a+"]),
+    ("CISSP", ["certified information systems security professional"]),
+    ("CISA", ["certified information systems auditor"]),
+    ("CEH", ["certified ethical hacker"]),
+    ("CCNA", ["cisco certified network associate"]),
+    ("PMP", ["project management professional"]),
+    ("Certified ScrumMaster", ["csm", "scrum master", "certified scrum master"]),
+    ("ITIL Foundation", ["itil"]),
+    ("Oracle Certified Java Programmer", ["ocjp", "oracle certified professional java", "ocpjp"]),
+    ("TensorFlow Developer Certificate", ["tensorflow developer"]),
+]
+
+# Word level rewrites applied to degrees before the alias lookup, so
+# "B.Sc. in CS" and "Bachelor's degree in Computer Science" meet on one key.
+DEGREE_WORD_ALIASES = {
+    "bachelors": "bachelor",
+    "bsc": "bachelor",
+    "bs": "bachelor",
+    "ba": "bachelor",
+    "be": "bachelor",
+    "btech": "bachelor",
+    "beng": "bachelor",
+    "undergraduate": "bachelor",
+    "masters": "master",
+    "msc": "master",
+    "ms": "master",
+    "ma": "master",
+    "me": "master",
+    "mtech": "master",
+    "meng": "master",
+    "doctor": "phd",
+    "cs": "computer science",
+}
+
+# "Bachelor of Technology" and "Master of Science" name the same degree as
+# "B.Tech" and "M.Sc", which the word aliases above reduce to the bare level,
+# so the qualifier right after a level is dropped.
+DEGREE_PHRASE_ALIASES = {
+    (level, qualifier): level
+    for level in ("bachelor", "master")
+    for qualifier in ("technology", "engineering", "science", "arts")
+}
+
+CERTIFICATE_WORD_ALIASES = {
+    "certification": "certified",
+    "certificate": "certified",
+}
+
+# Filler words dropped from degree and certificate keys
+STOPWORDS = {"a", "an", "and", "degree", "in", "of", "or", "the", "with", "&"}
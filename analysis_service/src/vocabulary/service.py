@@ -0,0 +1,120 @@
+import re
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left
+
+from src.vocabulary.aliases import (
+    CERTIFICATE_ALIASES,
+    CERTIFICATE_WORD_ALIASES,
+    DEGREE_ALIASES,
+    DEGREE_PHRASE_ALIASES,
+    DEGREE_WORD_ALIASES,
+    SKILL_ALIASES,
+    STOPWORDS,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Terms outside the alias table get a stable hashed ID above every canonical ID
+UNKNOWN_ID_BASE = 1 << 31
+
+
+class Vocabulary:
+    """
+    Canonical terms of one kind (skills, degrees or certificates).
+
+    Extracted strings are normalised to a key and looked up in a sorted key
+    array with a parallel array of IDs, so the table stays compact and a
+    lookup is a binary search. Canonical terms get dense IDs, their position
+    in the alias table. Unknown terms get a CRC32 based ID above
+    UNKNOWN_ID_BASE, so spelling variants of the same unknown term still
+    compare equal and IDs are identical in every process.
+    """
+
+    def __init__(self, kind, aliases, word_aliases=None, stopwords=(), phrase_aliases=None):
+        self.kind = kind
+        self.word_aliases = word_aliases or {}
+        self.phrase_aliases = phrase_aliases or {}
+        self.stopwords = set(stopwords)
+        self.names = [name for name, _ in aliases]
+
+        table = {}
+        for term_id, (name, alias_list) in enumerate(aliases):
+            for alias in [name, *alias_list]:
+                key = self.normalise(alias)
+                if table.setdefault(key, term_id) != term_id:
+                    raise ValueError(f"{kind} alias {alias!r} maps to two canonical terms")
+
+        self._keys = sorted(table)
+        self._ids = array("I", (table[key] for key in self._keys))
+
+    def normalise(self, term):
+        # "React.js", "ReactJS" and "react js" all become "reactjs"
+        text = unicodedata.normalize("NFKC", term).lower()
+        text = text.replace("'", "").replace("’", "").replace(".", "")
+        tokens = []
+        for token in TOKEN_PATTERN.findall(text):
+            token = self.word_aliases.get(token, token)
+            for word in token.split():
+                if word in self.stopwords:
+                    continue
+                # Word pairs such as "bachelor technology" collapse to one word
+                if tokens and (tokens[-1], word) in self.phrase_aliases:
+                    tokens[-1] = self.phrase_aliases[tokens[-1], word]
+                    continue
+                tokens.append(word)
+        return "".join(tokens)
+
+    def lookup(self, term):
+        """Return the ID of a term, None when the term is empty."""
+        key = self.normalise(term)
+        if not key:
+            return None
+
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._ids[index]
+        return UNKNOWN_ID_BASE + (zlib.crc32(key.encode("utf-8")) & 0x7FFFFFFF)
+
+    def name(self, term_id):
+        if term_id < len(self.names):
+            return self.names[term_id]
+        return None
+
+    def intern(self, terms):
+        """IDs aligned with terms, None for terms that normalise to nothing."""
+        return [self.lookup(term) if isinstance(term, str) else None for term in terms or []]
+
+    def stats(self):
+        return {"kind": self.kind, "canonical_terms": len(self.names), "aliases": len(self._keys)}
+
+
+skill_vocabulary = Vocabulary("skill", SKILL_ALIASES)
+degree_vocabulary = Vocabulary("degree", DEGREE_ALIASES, DEGREE_WORD_ALIASES, STOPWORDS, DEGREE_PHRASE_ALIASES)
+certificate_vocabulary = Vocabulary("certificate", CERTIFICATE_ALIASES, CERTIFICATE_WORD_ALIASES, STOPWORDS)
+
+# Analysis output field -> vocabulary, the IDs are stored under "<field>_ids"
+FIELD_VOCABULARIES = {
+    "technical_skill": skill_vocabulary,
+    "degree": degree_vocabulary,
+    "certificate": certificate_vocabulary,
+}
+
+
+def annotate_ids(analysis):
+    """
+    Store the canonical IDs next to the raw strings of an analysis output.
+
+    Args:
+        analysis (dict): Candidate or job analysis from the LLM
+
+    Returns:
+        dict: The same analysis with technical_skill_ids, degree_ids and certificate_ids
+    """
+    for field, vocabulary in FIELD_VOCABULARIES.items():
+        values = analysis.get(field)
+        if isinstance(values, str):
+            values = [values]
+        analysis[f"{field}_ids"] = vocabulary.intern(values if isinstance(values, list) else [])
+    return analysis
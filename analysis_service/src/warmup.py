@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+from src.candidate.config import candidate_config
+from src.candidate.extraction import extraction_pool
+from src.candidate.prompts import fn_candidate_analysis
+from src.integrations.client_pool import client_pool
+from src.integrations.providers import get_provider
+from src.integrations.tokenizer import get_encoding
+from src.job.config import job_config
+from src.matching.config import matching_config
+from src.utils import LOGGER
+from starlette.concurrency import run_in_threadpool
+
+
+class Readiness:
+    """
+    Warmup state of the components a request depends on.
+
+    The service is alive as soon as it accepts connections (/healthz), but
+    only ready (/readyz) once every component finished warming up, so the
+    first requests after a deploy or scale-out never pay for imports, client
+    construction or worker start-up.
+    """
+
+    def __init__(self, components):
+        self._lock = threading.Lock()
+        self.components = {name: "pending" for name in components}
+        self.errors = {}
+        self.started = time.monotonic()
+        self.seconds = {}
+
+    def mark(self, name, error=None):
+        with self._lock:
+            self.components[name] = "error" if error else "ready"
+            self.seconds[name] = round(time.monotonic() - self.started, 3)
+            if error:
+                self.errors[name] = error
+
+    @property
+    def ready(self):
+        with self._lock:
+            return all(state == "ready" for state in self.components.values())
+
+    def stats(self):
+        ready = self.ready
+        with self._lock:
+            return {
+                "ready": ready,
+                "components": dict(self.components),
+                "seconds": dict(self.seconds),
+                "errors": dict(self.errors),
+            }
+
+
+def warm_llm_client():
+    # Builds the pooled HTTP clients and the tool-bound model, no request is sent
+    if get_provider().name == "azure":
+        client_pool.get(fn_candidate_analysis)
+
+
+def warm_tokenizer():
+    model_names = {
+        candidate_config.MODEL_NAME,
+        job_config.MODEL_NAME,
+        matching_config.MODEL_NAME,
+        get_provider().model_name,
+    }
+    for model_name in model_names:
+        get_encoding(model_name)
+
+
+def warm_parsers():
+    import pypdf  # noqa: F401
+    import zstandard  # noqa: F401
+
+
+def warm_extraction_pool():
+    extraction_pool.warmup()
+
+
+WARMUP_STEPS = {
+    "llm_client": warm_llm_client,
+    "tokenizer": warm_tokenizer,
+    "parsers": warm_parsers,
+    "extraction_pool": warm_extraction_pool,
+}
+
+readiness = Readiness(WARMUP_STEPS)
+
+
+async def warmup():
+    """Run every warmup step off the event loop, the app serves /healthz meanwhile."""
+    for name, step in WARMUP_STEPS.items():
+        try:
+            await run_in_threadpool(step)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER.error(f"Warmup of {name} failed: {type(e).__name__}: {str(e)}")
+            readiness.mark(name, error=f"{type(e).__name__}: {str(e)}")
+        else:
+            readiness.mark(name)
+    LOGGER.info(f"Warmup done: {readiness.stats()}")
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.integrations.cache import LLMResultCache
+
+
+def test_waiting_caller_survives_cancelled_first_caller():
+    async def scenario():
+        cache = LLMResultCache(max_entries=8)
+        release = asyncio.Event()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return {"score": 80}
+
+        first = asyncio.create_task(cache.aget_or_compute("key", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.aget_or_compute("key", compute))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == {"score": 80}
+        assert calls == [1]
+        assert await cache.aget_or_compute("key", compute) == {"score": 80}
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_waiting_caller():
+    async def scenario():
+        cache = LLMResultCache(max_entries=8)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("provider down")
+
+        results = await asyncio.gather(
+            cache.aget_or_compute("key", compute),
+            cache.aget_or_compute("key", compute),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert cache.stats()["coalesced"] == 1
+
+    asyncio.run(scenario())
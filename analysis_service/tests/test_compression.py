@@ -0,0 +1,52 @@
+from src.candidate import compression
+from src.candidate.compression import remove_repeated_lines, trim_to_budget
+
+
+def test_dated_lines_at_page_edges_are_kept():
+    pages = [
+        [
+            "John Doe - Curriculum Vitae",
+            f"Software Engineer, Company {page} ({2010 + 2 * page} – {2012 + 2 * page})",
+            f"Built service {page}",
+            "Middle of the page",
+            f"Project {page}/{page + 1}",
+            f"GPA 3.{page}",
+            f"Page {page + 1} of 10",
+        ]
+        for page in range(10)
+    ]
+
+    cleaned = remove_repeated_lines(pages)
+
+    lines = [line for page in cleaned for line in page]
+    assert lines.count("John Doe - Curriculum Vitae") == 1
+    assert not any(line.startswith("Page ") for line in lines)
+    for page in range(10):
+        assert f"Software Engineer, Company {page} ({2010 + 2 * page} – {2012 + 2 * page})" in lines
+        assert f"Project {page}/{page + 1}" in lines
+        assert f"GPA 3.{page}" in lines
+
+
+def test_top_and_bottom_edges_are_compared_separately():
+    pages = [
+        ["Header", *(f"First page line {i}" for i in range(6)), "Skills"],
+        ["Intro", *(f"Second page line {i}" for i in range(6)), "Header"],
+    ]
+
+    assert remove_repeated_lines(pages) == pages
+
+
+def test_trimming_keeps_contacts_and_later_sections(monkeypatch):
+    monkeypatch.setattr(compression, "count_tokens", lambda text, model_name=None: len(text.split()))
+    lines = (
+        ["John Doe", "john@example.com"]
+        + ["EXPERIENCE"]
+        + [f"Delivered project number {i}" for i in range(100)]
+        + ["SKILLS", "python sql docker", "EDUCATION", "BSc Computer Science"]
+    )
+
+    kept = trim_to_budget(lines, 200, "model")
+
+    assert kept[:3] == ["John Doe", "john@example.com", "EXPERIENCE"]
+    assert "python sql docker" in kept
+    assert "BSc Computer Science" in kept
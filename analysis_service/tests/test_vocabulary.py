@@ -0,0 +1,31 @@
+import pytest
+
+from src.vocabulary import degree_vocabulary, skill_vocabulary
+
+
+@pytest.mark.parametrize(
+    "full_name, abbreviation",
+    [
+        ("Bachelor of Technology in Computer Science", "B.Tech CS"),
+        ("Bachelor of Engineering in Computer Science", "B.E. Computer Science"),
+        ("Bachelor of Science in Computer Science", "B.Sc. in CS"),
+        ("Master of Science in CS", "M.Sc CS"),
+        ("Master of Technology in Computer Science", "M.Tech CSE"),
+        ("Bachelor of Technology", "B.Tech"),
+        ("Bachelor of Arts", "BA"),
+        ("Master of Science in Data Science", "Master Data Science"),
+    ],
+)
+def test_full_degree_names_match_abbreviations(full_name, abbreviation):
+    assert degree_vocabulary.lookup(full_name) == degree_vocabulary.lookup(abbreviation)
+    assert degree_vocabulary.name(degree_vocabulary.lookup(full_name)) is not None
+
+
+def test_engineering_discipline_is_kept():
+    electrical = degree_vocabulary.lookup("Bachelor of Engineering in Electrical Engineering")
+    assert degree_vocabulary.name(electrical) == "Bachelor Electrical Engineering"
+    assert electrical != degree_vocabulary.lookup("Bachelor of Engineering in Mechanical Engineering")
+
+
+def test_skill_spellings_share_an_id():
+    assert len({skill_vocabulary.lookup(term) for term in ["React", "ReactJS", "React.js", "react js"]}) == 1
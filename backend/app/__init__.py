@@ -1,7 +1,7 @@
 import os
 
 from app.blueprint import register_routing
-from app.db import mongo
+from app.db import ensure_indexes, mongo
 from app.extention import cors
 from app.utils.logging import configure_logging
 from flask import Flask
@@ -18,6 +18,9 @@ def create_app(settings_module):
     # Logging configuration
     configure_logging(app)
 
+    # Indexes the matching queries depend on
+    ensure_indexes()
+
     # Register Blueprint
     register_routing(app)
 
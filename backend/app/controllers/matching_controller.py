@@ -6,10 +6,10 @@ from app.schemas.matching_schema import (
     MatchingDetailSchema,
     ShortlistNotificationSchema,
 )
-from app.services import matching_service, notification_service
+from app.services import matching_run_service, matching_service, notification_service
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import send_file, request
+from flask import Response, send_file, request, stream_with_context
 import os
 
 blp = Blueprint("Matching", __name__, description="Matching API")
@@ -19,10 +19,31 @@ blp = Blueprint("Matching", __name__, description="Matching API")
 class Matching(MethodView):
     @blp.arguments(ProcessMatchingSchema)
     def post(self, matching_data):
-        result = matching_service.process_matching(matching_data)
+        # Queued for the matching workers, poll the run for progress
+        result = matching_run_service.create_run(matching_data)
+        return result, 202
+
+
+@blp.route("/process-matching/<string:run_id>")
+class MatchingRun(MethodView):
+    def get(self, run_id):
+        result = matching_run_service.get_run(run_id)
         return result
 
 
+@blp.route("/process-matching/<string:run_id>/events")
+class MatchingRunEvents(MethodView):
+    def get(self, run_id):
+        """Server-sent events with every newly scored candidate and the run progress"""
+        events = matching_run_service.stream_run_events(run_id, request.headers.get("Last-Event-ID"))
+        return Response(
+            stream_with_context(events),
+            mimetype="text/event-stream",
+            # No caching or proxy buffering, events must reach the browser as they are sent
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
 @blp.route("/data-matching")
 class MatchingFilter(MethodView):
     @blp.response(200, MatchingSchema(many=True))
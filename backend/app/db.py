@@ -1,3 +1,31 @@
+import logging
+
 from flask_pymongo import PyMongo
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
 
 mongo = PyMongo()
+
+# (collection, keys, options) of the indexes the services rely on
+INDEXES = [
+    # One LLM score per job and candidate, also serves the matched-ids lookup of a job
+    ("matching", [("job_id", ASCENDING), ("candidate_id", ASCENDING)], {"unique": True}),
+    # Prefilter scores are upserted and read by job
+    ("prefilter", [("job_id", ASCENDING), ("candidate_id", ASCENDING)], {"unique": True}),
+    # At most one queued or running matching run per job
+    ("matching_run", [("job_id", ASCENDING)], {"unique": True, "partialFilterExpression": {"active": True}}),
+    # Workers claim the oldest active run whose lease expired
+    ("matching_run", [("active", ASCENDING), ("lease_expires_at", ASCENDING), ("created_at", ASCENDING)], {}),
+]
+
+
+def ensure_indexes():
+    """Create missing indexes, existing ones are left untouched"""
+    for collection, keys, options in INDEXES:
+        try:
+            mongo.db[collection].create_index(keys, **options)
+        except PyMongoError as e:
+            # Duplicates written before the index existed must be cleaned up by hand
+            logger.error(f"Can not create index {keys} on {collection}! Error: {str(e)}")
@@ -3,6 +3,9 @@ from marshmallow import Schema, fields, validate
 
 class ProcessMatchingSchema(Schema):
     job_name = fields.Str(required=True)
+    packed = fields.Bool(required=False)
+    top_k = fields.Int(validate=validate.Range(min=0), required=False)
+    min_score = fields.Float(validate=validate.Range(min=0, max=1), required=False)
 
 
 class AnalyseSchema(Schema):
@@ -28,6 +31,8 @@ class MatchingFilterPageSchema(Schema):
     job_name = fields.Str(required=True)
     page_size = fields.Int(allow_none=True, required=True)
     page = fields.Int(allow_none=True, required=True)
+    # "provisional" ranks candidates without an LLM score by the deterministic score
+    mode = fields.Str(validate=validate.OneOf(["llm", "provisional"]), required=False)
 
 
 class PlainMatchingSchema(Schema):
@@ -39,6 +44,8 @@ class PlainMatchingSchema(Schema):
     score = fields.Str(required=True)
     summary_comment = fields.Str(required=True)
     matching_status = fields.Bool(required=True)
+    provisional = fields.Bool()
+    prefilter_score = fields.Float()
 
 
 class MatchingPageSchema(Schema):
@@ -12,6 +12,7 @@ from flask import request
 from flask_smorest import abort
 from pytz import timezone
 from app.services import notification_service
+from app.utils.http import analysis_request_options
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -80,6 +81,38 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in {"pdf", "docx"}
 
 
+def analyse_cv(file, filehash, retain=True):
+    """
+    Analyse a CV, offering its hash before uploading its bytes
+
+    The analysis service answers a known hash from its stored text and only
+    asks for the file (404) when it has never seen the content.
+
+    Args:
+        file: The uploaded file, rewound to the start
+        filehash (str): SHA-256 of the file contents
+        retain (bool): Whether the analysis service should count a new reference to the CV
+
+    Returns:
+        requests.Response: The analysis response
+    """
+    analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/candidate/analyse"
+    options = analysis_request_options(config.ANALYSIS_DEADLINE_MS)
+
+    if config.ANALYSIS_HASH_FIRST:
+        response = requests.post(
+            analysis_endpoint_url,
+            data={"filehash": filehash, "retain": str(retain).lower()},
+            **options,
+        )
+        if response.status_code != 404:
+            logger.info(f"CV {file.filename} analysed from hash, upload skipped")
+            return response
+
+    files = {"file": (file.filename, file.stream, file.mimetype)}
+    return requests.post(analysis_endpoint_url, files=files, **options)
+
+
 def process_upload_file(file, existing_candidate_id=None):
     """
     Process an uploaded resume file
@@ -109,9 +142,7 @@ def process_upload_file(file, existing_candidate_id=None):
     # Move the cursor to the beginning of the file
     file.seek(0)
 
-    analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/candidate/analyse"
-    files = {"file": (file.filename, file.stream, file.mimetype)}
-    response = requests.post(analysis_endpoint_url, files=files)
+    response = analyse_cv(file, filehash)
 
     # Check response status and return appropriate response
     if response.status_code != 200:
@@ -157,6 +188,10 @@ def process_upload_file(file, existing_candidate_id=None):
             if result.modified_count != 1:
                 logger.error(f"Failed to update candidate: {existing_candidate_id}")
                 abort(500, message="Failed to update candidate information")
+
+            # The candidate now holds a reference to the new CV, drop the one to its previous CV
+            if existing_candidate.get("filehash"):
+                release_cv(existing_candidate["filehash"])
                 
             # Also update any matching records to reflect that the candidate has a resume now
             mongo.db.matching.update_many(
@@ -201,16 +236,40 @@ def upload_file_cv():
 
 
 def delete_candidate(candidate_id):
-    result = mongo.db.candidate.delete_one({"_id": ObjectId(candidate_id)})
-    if result.deleted_count == 1:
+    candidate = mongo.db.candidate.find_one_and_delete({"_id": ObjectId(candidate_id)})
+    if candidate is not None:
         # Clean matching
         mongo.db.matching.delete_many({"candidate_id": ObjectId(candidate_id)})
 
+        # Let the analysis service garbage collect the stored CV
+        if candidate.get("filehash"):
+            release_cv(candidate["filehash"])
+
         return {"message": "Document deleted successfully"}
     else:
         return abort("Document not found!")
 
 
+def release_cv(filehash):
+    """
+    Drop the analysis service's reference to a stored CV
+
+    Failures are only logged, an unreleased CV costs disk space, not correctness.
+
+    Args:
+        filehash (str): SHA-256 of the CV file
+    """
+    try:
+        response = requests.delete(
+            f"{config.ANALYSIS_SERVICE_URL}/candidate/cv/{filehash}",
+            **analysis_request_options(config.ANALYSIS_DEADLINE_MS),
+        )
+        if response.status_code not in (200, 404):
+            logger.warning(f"Can not release CV {filehash}! Status: {response.status_code}")
+    except requests.RequestException as e:
+        logger.warning(f"Can not release CV {filehash}! Error: {str(e)}")
+
+
 def bulk_upload_candidates(candidates):
     """
     Bulk upload candidates from Excel
@@ -9,6 +9,7 @@ from bson.objectid import ObjectId
 from flask_smorest import abort
 from pytz import timezone
 from app.services import notification_service
+from app.utils.http import analysis_request_options
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -29,7 +30,11 @@ def post_job(job_data):
     )
 
     analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/job/analyse"
-    response = requests.post(analysis_endpoint_url, json=job_data)
+    response = requests.post(
+        analysis_endpoint_url,
+        json=job_data,
+        **analysis_request_options(config.ANALYSIS_DEADLINE_MS),
+    )
 
     # Check response status and return appropriate response
     if response.status_code != 200:
@@ -133,7 +138,11 @@ def update_job(job_data, job_id):
         logger.info("Update analyse job")
 
         analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/job/analyse"
-        response = requests.post(analysis_endpoint_url, json=job_data)
+        response = requests.post(
+            analysis_endpoint_url,
+            json=job_data,
+            **analysis_request_options(config.ANALYSIS_DEADLINE_MS),
+        )
 
         # Check response status and return appropriate response
         if response.status_code != 200:
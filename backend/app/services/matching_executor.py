@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+
+import config
+from bson.objectid import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class MatchingResultWriter:
+    """
+    Buffer matching results and write them with unordered bulk_write
+
+    Safe to share between threads. A result that is already stored for the
+    same job and candidate counts as a duplicate, not as a failure.
+    """
+
+    def __init__(self, collection, buffer_size=None):
+        self.collection = collection
+        self.buffer_size = max(buffer_size or config.MATCHING_WRITE_BUFFER, 1)
+        self._buffer = []
+        self._lock = threading.Lock()
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    def add(self, document):
+        with self._lock:
+            self._buffer.append(InsertOne(document))
+            if len(self._buffer) < self.buffer_size:
+                return
+            operations, self._buffer = self._buffer, []
+        self._write(operations)
+
+    def flush(self):
+        with self._lock:
+            operations, self._buffer = self._buffer, []
+        if operations:
+            self._write(operations)
+
+    def _write(self, operations):
+        inserted = duplicates = failed = 0
+        try:
+            inserted = self.collection.bulk_write(operations, ordered=False).inserted_count
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            inserted = e.details.get("nInserted", 0)
+            duplicates = sum(1 for error in errors if error.get("code") == DUPLICATE_KEY_ERROR)
+            failed = len(errors) - duplicates
+            if failed:
+                logger.error(f"Upload {failed} matching documents to Database failed! Error: {errors[0].get('errmsg')}")
+        except PyMongoError as e:
+            failed = len(operations)
+            logger.error(f"Upload {failed} matching documents to Database failed! Error: {str(e)}")
+
+        with self._lock:
+            self.inserted += inserted
+            self.duplicates += duplicates
+            self.failed += failed
+
+
+class MatchingExecutor:
+    """
+    Score the candidates of one job with bounded parallelism
+
+    Candidates are split into batches that stream from the analysis service
+    on a thread pool, so wall-clock time follows the concurrency setting
+    rather than the candidate count. A failed candidate or batch is counted
+    and logged, the rest of the run goes on.
+    """
+
+    def __init__(self, job, score_batch, writer, concurrency=None, batch_size=None):
+        """
+        Args:
+            job (dict): Serialized job document
+            score_batch (callable): Takes a list of candidates, yields analysis results with their index
+            writer (MatchingResultWriter): Where scored results are written
+            concurrency (int): Batches in flight
+            batch_size (int): Max candidates per batch
+        """
+        self.job = job
+        self.score_batch = score_batch
+        self.writer = writer
+        self.concurrency = max(concurrency or config.MATCHING_CONCURRENCY, 1)
+        self.batch_size = max(batch_size or config.MATCHING_BATCH_SIZE, 1)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.failed = 0
+
+    def cancel(self):
+        """Stop after the results in flight, batches not started yet are skipped"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def progress(self):
+        """Flush buffered results and count what is stored so far"""
+        self.writer.flush()
+        return {
+            "scored": self.writer.inserted,
+            "duplicates": self.writer.duplicates,
+            "failed": self.failed + self.writer.failed,
+        }
+
+    def _fail(self, count):
+        with self._lock:
+            self.failed += count
+
+    def _run_batch(self, batch):
+        if self.cancelled:
+            return
+        pending = set(range(len(batch)))
+        try:
+            for item in self.score_batch(batch):
+                if self.cancelled:
+                    return
+                candidate = batch[item["index"]]
+                pending.discard(item["index"])
+
+                if item["status"] != "ok":
+                    logger.error(
+                        f"Fail to analyse matching: {candidate['candidate_name']} - {self.job['job_name']}. Error: {item.get('detail')}"
+                    )
+                    self._fail(1)
+                    continue
+
+                logger.info(f"Matching candidate & job: {candidate['candidate_name']} - {self.job['job_name']}")
+
+                # Get the content of the response
+                response_content = item["result"]
+                response_content["job_id"] = ObjectId(self.job["_id"])
+                response_content["candidate_id"] = ObjectId(candidate["_id"])
+                self.writer.add(response_content)
+        except Exception as e:
+            # The stream broke, candidates without a result are failed
+            logger.error(f"Fail to analyse matching batch of {len(batch)} for {self.job['job_name']}. Error: {str(e)}")
+            self._fail(len(pending))
+            return
+
+        if pending and not self.cancelled:
+            # The stream ended without a result for some candidates
+            logger.error(
+                f"Matching batch for {self.job['job_name']} ended without results for indexes {sorted(pending)}"
+            )
+            self._fail(len(pending))
+
+    def run(self, candidates):
+        """
+        Score and store every candidate
+
+        Args:
+            candidates (list): Serialized candidate documents
+
+        Returns:
+            dict: Counts of candidates scored, already stored and failed, and the elapsed seconds
+        """
+        start = time.perf_counter()
+
+        # Spread the candidates over the workers, a single oversized batch would run alone
+        batch_size = min(self.batch_size, max(ceil(len(candidates) / self.concurrency), 1))
+        batches = [candidates[i : i + batch_size] for i in range(0, len(candidates), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="matching") as pool:
+            list(pool.map(self._run_batch, batches))
+
+        summary = {
+            "candidates": len(candidates),
+            **self.progress(),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        logger.info(
+            f"Matching run for {self.job['job_name']}: {len(batches)} batches on {self.concurrency} threads, {summary}"
+        )
+        return summary
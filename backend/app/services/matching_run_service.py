@@ -0,0 +1,400 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import config
+from app.db import mongo
+from app.services import matching_service
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from flask_smorest import abort
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Event stream: browser reconnect delay, idle keep-alive and how far back a reconnect looks
+STREAM_RETRY_MS = 2000
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_LOOKBACK_SECONDS = 5
+
+
+def utcnow():
+    # Naive UTC, the way pymongo returns stored datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_status(run):
+    """
+    Progress of a matching run
+
+    Args:
+        run (dict): matching_run document
+
+    Returns:
+        dict: Status, done/total, throughput in candidates per second and ETA in seconds
+    """
+    total = run.get("total")
+    done = run.get("done", 0)
+    failed = run.get("failed", 0)
+
+    # Throughput of the current attempt, candidates resumed from an earlier one are not counted
+    throughput = 0.0
+    attempt_started_at = run.get("attempt_started_at")
+    if attempt_started_at is not None:
+        elapsed = ((run.get("finished_at") or utcnow()) - attempt_started_at).total_seconds()
+        if elapsed > 0:
+            throughput = (done + failed - run.get("resumed_done", 0)) / elapsed
+
+    eta_seconds = None
+    if run["status"] == STATUS_RUNNING and total is not None and throughput > 0:
+        eta_seconds = round(max(total - done - failed, 0) / throughput, 1)
+
+    return {
+        "run_id": str(run["_id"]),
+        "job_name": run["job_name"],
+        "status": run["status"],
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "progress": done / total if total else (1.0 if run["status"] == STATUS_DONE else 0.0),
+        "throughput": round(throughput, 3),
+        "eta_seconds": eta_seconds,
+        "attempts": run.get("attempts", 0),
+        "error": run.get("error"),
+        "created_at": run["created_at"],
+        "started_at": run.get("started_at"),
+        "finished_at": run.get("finished_at"),
+    }
+
+
+def create_run(matching_data):
+    """
+    Queue a matching run for a job, the matching workers pick it up
+
+    A job has at most one active run, asking again returns the active one.
+
+    Args:
+        matching_data (dict): job_name and the options of the run
+
+    Returns:
+        dict: Status of the queued or already active run
+    """
+    job = mongo.db.job.find_one_or_404({"job_name": matching_data["job_name"]})
+    now = utcnow()
+    run = {
+        "job_id": job["_id"],
+        "job_name": job["job_name"],
+        "options": {key: matching_data[key] for key in ("packed", "top_k", "min_score") if key in matching_data},
+        "status": STATUS_QUEUED,
+        # Set while queued or running, a partial unique index keeps one active run per job
+        "active": True,
+        "attempts": 0,
+        "created_at": now,
+        # Expired from the start, so the first worker that polls can claim it
+        "lease_expires_at": now,
+    }
+    try:
+        run["_id"] = mongo.db.matching_run.insert_one(run).inserted_id
+    except DuplicateKeyError:
+        run = mongo.db.matching_run.find_one({"job_id": job["_id"], "active": True})
+        if run is None:
+            abort(409, message="Matching run finished meanwhile, please retry!")
+        logger.info(f"Matching run already active for {job['job_name']}: {run['_id']}")
+        return run_status(run)
+
+    logger.info(f"Queued matching run {run['_id']} for {job['job_name']}")
+    return run_status(run)
+
+
+def find_run(run_id):
+    try:
+        run = mongo.db.matching_run.find_one({"_id": ObjectId(run_id)})
+    except InvalidId:
+        abort(400, message="Invalid matching run id!")
+    if run is None:
+        abort(404, message="Matching run not found!")
+    return run
+
+
+def get_run(run_id):
+    return run_status(find_run(run_id))
+
+
+def sse_event(event, data, event_id=None):
+    """Format one server-sent event"""
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_run_events(run_id, last_event_id=None):
+    """
+    Server-sent events of a matching run, read from MongoDB as the workers write
+
+    Sends a "result" event with the table row of every candidate scored by
+    the run, ids are the matching ids so a reconnecting EventSource resumes
+    after the last one it got. "progress" events carry the run status with a
+    live done counter, and "end" closes the stream once the run finished.
+    Streams are closed after MATCHING_STREAM_MAX_SECONDS, the browser
+    reconnects on its own.
+
+    Args:
+        run_id (str): Matching run id
+        last_event_id (str): Last-Event-ID header of a reconnecting client
+
+    Returns:
+        generator: Event stream chunks
+    """
+    run = find_run(run_id)
+    run_start_id = ObjectId.from_datetime(run["created_at"])
+
+    since = run["created_at"]
+    if last_event_id and ObjectId.is_valid(last_event_id):
+        since = ObjectId(last_event_id).generation_time
+    # Ids are made by several worker processes, look back a little and drop what was sent
+    since_id = ObjectId.from_datetime(since - timedelta(seconds=STREAM_LOOKBACK_SECONDS))
+
+    def events():
+        nonlocal run
+        seen_ids = set()
+        last_progress = None
+        live_done = 0
+        started = last_sent = time.monotonic()
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        while True:
+            finished = run["status"] in (STATUS_DONE, STATUS_FAILED)
+            rows = matching_service.get_scored_rows(run["job_id"], since_id, seen_ids)
+            for matching_id, row in rows:
+                yield sse_event("result", row, event_id=str(matching_id))
+
+            status = run_status(run)
+            if rows or last_progress is None:
+                scored = mongo.db.matching.count_documents({"job_id": run["job_id"], "_id": {"$gte": run_start_id}})
+                live_done = run.get("matched_before", 0) + scored
+            status["done"] = max(status["done"], live_done)
+            if status["total"]:
+                status["progress"] = min(status["done"] / status["total"], 1.0)
+
+            progress = (status["status"], status["done"], status["failed"], status["total"])
+            if progress != last_progress:
+                yield sse_event("progress", status)
+                last_progress = progress
+                last_sent = time.monotonic()
+            elif rows:
+                last_sent = time.monotonic()
+
+            # Rows are read before the status, so a finished run has nothing left to send
+            if finished:
+                yield sse_event("end", status)
+                return
+            if time.monotonic() - started > config.MATCHING_STREAM_MAX_SECONDS:
+                return
+            if time.monotonic() - last_sent > STREAM_KEEPALIVE_SECONDS:
+                # Comment line, keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            time.sleep(config.MATCHING_STREAM_POLL_SECONDS)
+            run = mongo.db.matching_run.find_one({"_id": run["_id"]})
+
+    return events()
+
+
+def claim_run(owner):
+    """
+    Take the oldest queued run, or a running one whose worker stopped renewing its lease
+
+    Returns:
+        dict: The claimed run, None when there is nothing to do
+    """
+    now = utcnow()
+    return mongo.db.matching_run.find_one_and_update(
+        {"active": True, "lease_expires_at": {"$lte": now}},
+        {
+            "$set": {
+                "status": STATUS_RUNNING,
+                "lease_owner": owner,
+                "lease_expires_at": now + timedelta(seconds=config.MATCHING_RUN_LEASE_SECONDS),
+                "attempt_started_at": now,
+            },
+            "$min": {"started_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def update_run(run, owner, fields, unset=None, inc=None, min_fields=None):
+    """Update a run while holding its lease, returns False when the lease was lost"""
+    update = {"$set": fields}
+    if min_fields:
+        update["$min"] = min_fields
+    if unset:
+        update["$unset"] = {field: "" for field in unset}
+    if inc:
+        update["$inc"] = inc
+    result = mongo.db.matching_run.update_one({"_id": run["_id"], "lease_owner": owner}, update)
+    return result.matched_count == 1
+
+
+def finish_run(run, owner, status, **fields):
+    update_run(
+        run,
+        owner,
+        {"status": status, "finished_at": utcnow(), **fields},
+        unset=["active", "lease_owner", "lease_expires_at"],
+    )
+
+
+def release_run(run, owner, error=None, refund_attempt=False, delay=0):
+    """Hand a run back to the queue, it can be claimed again after delay seconds"""
+    update_run(
+        run,
+        owner,
+        {"status": STATUS_QUEUED, "lease_expires_at": utcnow() + timedelta(seconds=delay), "error": error},
+        unset=["lease_owner"],
+        # A worker shutdown is not the run's fault
+        inc={"attempts": -1} if refund_attempt else None,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds before a failed run is retried, doubling with every attempt"""
+    return config.MATCHING_RUN_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+
+
+def execute_run(run, owner, stop_event):
+    """
+    Plan and score a claimed run, renewing its lease and reporting progress on the way
+
+    The lease is renewed from the start, planning and registering the job
+    with the analysis service can take a while. The run stops early when the
+    worker is asked to stop or loses the lease, candidates scored so far are
+    kept and skipped when the run is resumed.
+    """
+    job = mongo.db.job.find_one({"_id": run["job_id"]})
+    if job is None:
+        finish_run(run, owner, STATUS_FAILED, error="Job was deleted")
+        return
+
+    finished = threading.Event()
+    lease_lost = threading.Event()
+    # Filled in once planning is done, read by the heartbeat
+    state = {"executor": None, "resumed_done": 0}
+
+    def heartbeat():
+        last_beat = time.monotonic()
+        # Wake up every second so a stop request is seen quickly
+        while not finished.wait(1):
+            executor = state["executor"]
+            if stop_event.is_set() and executor is not None:
+                executor.cancel()
+            if time.monotonic() - last_beat < config.MATCHING_RUN_HEARTBEAT_SECONDS:
+                continue
+            last_beat = time.monotonic()
+
+            fields = {"lease_expires_at": utcnow() + timedelta(seconds=config.MATCHING_RUN_LEASE_SECONDS)}
+            if executor is not None:
+                progress = executor.progress()
+                fields["done"] = state["resumed_done"] + progress["scored"] + progress["duplicates"]
+                fields["failed"] = progress["failed"]
+            if not update_run(run, owner, fields):
+                logger.warning(f"Lost the lease of matching run {run['_id']}, stopping")
+                lease_lost.set()
+                if executor is not None:
+                    executor.cancel()
+
+    heartbeat_thread = threading.Thread(target=heartbeat, name=f"matching-run-{run['_id']}", daemon=True)
+    heartbeat_thread.start()
+    try:
+        selected, candidates = matching_service.plan_matching(job, run["options"])
+        resumed_done = selected - len(candidates)
+        if lease_lost.is_set() or not update_run(
+            run,
+            owner,
+            {"total": selected, "done": resumed_done, "failed": 0, "resumed_done": resumed_done},
+            # Matched by earlier runs, kept from the first attempt for the live progress of the event stream
+            min_fields={"matched_before": resumed_done},
+        ):
+            return
+
+        executor = matching_service.create_matching_executor(job, candidates, run["options"])
+        state["resumed_done"] = resumed_done
+        state["executor"] = executor
+        # Stop or lease loss seen by the heartbeat while planning
+        if stop_event.is_set() or lease_lost.is_set():
+            executor.cancel()
+        summary = executor.run(candidates)
+    finally:
+        finished.set()
+        heartbeat_thread.join()
+
+    done = resumed_done + summary["scored"] + summary["duplicates"]
+    if executor.cancelled:
+        update_run(run, owner, {"done": done, "failed": summary["failed"]})
+        release_run(run, owner, refund_attempt=stop_event.is_set())
+        return
+
+    if summary["failed"] and run["attempts"] < config.MATCHING_RUN_MAX_ATTEMPTS:
+        # The analysis service failed mid-run, retry later, candidates scored so far are skipped
+        error = f"{summary['failed']} candidates failed"
+        logger.warning(f"Matching run {run['_id']} for {run['job_name']}: {error}, retrying")
+        update_run(run, owner, {"done": done, "failed": summary["failed"]})
+        release_run(run, owner, error=error, delay=retry_delay(run["attempts"]))
+        return
+
+    # Out of attempts, the run is done with the candidates that could be scored
+    error = f"{summary['failed']} candidates failed after {run['attempts']} attempts" if summary["failed"] else None
+    finish_run(run, owner, STATUS_DONE, done=done, failed=summary["failed"], error=error)
+    logger.info(f"Finished matching run {run['_id']} for {run['job_name']}: {summary}")
+
+
+def run_worker(stop_event, owner=None):
+    """
+    Claim and execute matching runs until stop_event is set
+
+    Args:
+        stop_event (threading.Event): Set to stop, the current run is handed back to the queue
+        owner (str): Lease owner name, defaults to host and pid
+    """
+    owner = owner or worker_id()
+    logger.info(f"Matching worker {owner} started")
+    while not stop_event.is_set():
+        run = claim_run(owner)
+        if run is None:
+            stop_event.wait(config.MATCHING_WORKER_POLL_SECONDS)
+            continue
+
+        logger.info(f"Matching worker {owner} claimed run {run['_id']} (attempt {run['attempts']})")
+        if run["attempts"] > config.MATCHING_RUN_MAX_ATTEMPTS:
+            finish_run(run, owner, STATUS_FAILED, error=f"Gave up after {config.MATCHING_RUN_MAX_ATTEMPTS} attempts")
+            continue
+
+        try:
+            execute_run(run, owner, stop_event)
+        except Exception as e:
+            logger.exception(f"Matching run {run['_id']} failed: {str(e)}")
+            if run["attempts"] >= config.MATCHING_RUN_MAX_ATTEMPTS:
+                finish_run(run, owner, STATUS_FAILED, error=str(e))
+            else:
+                # Back off so a short outage of the analysis service does not use up every attempt
+                release_run(run, owner, error=str(e), delay=retry_delay(run["attempts"]))
+    logger.info(f"Matching worker {owner} stopped")
@@ -1,13 +1,17 @@
+import json
 import logging
 from math import ceil
 from datetime import datetime
 import os
+import time
 
 import config
-import requests
 from app.db import mongo
 from bson.objectid import ObjectId
 from flask_smorest import abort
+from app.services import prefilter_service, scoring_service
+from app.services.matching_executor import MatchingExecutor, MatchingResultWriter
+from app.utils.http import analysis_request_options, analysis_session
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -17,6 +21,12 @@ from reportlab.lib.units import inch
 # Create logger for this module
 logger = logging.getLogger(__name__)
 
+# Candidate fields needed to prefilter and score, the analysis service only reads the rubric sections
+MATCHING_CANDIDATE_PROJECTION = {
+    "candidate_name": 1,
+    **{field: 1 for field in prefilter_service.FIELD_WEIGHTS},
+}
+
 
 # Helper function to serialize MongoDB ObjectId
 def serialize_doc(doc):
@@ -29,67 +39,213 @@ def get_all_matching():
     return result
 
 
-def process_matching(matching_data):
-    job_name = matching_data["job_name"]
-    job = mongo.db.job.find_one_or_404({"job_name": job_name})
+def register_job_context(job):
+    """
+    Register a job with the analysis service so matching calls send only its key
 
-    # Get all candidate
-    candidates = mongo.db.candidate.find()
+    Args:
+        job (dict): Serialized job document
 
-    # Loop matching to caculate score for each candidate
-    for candidate in candidates:
-        # Skip candidates without resumes
-        if candidate.get("has_resume") is False:
-            logger.info(
-                f"Skipping candidate without resume: {candidate['candidate_name']}"
-            )
-            continue
+    Returns:
+        str: Job key to pass to the matching routes
 
-        # Check exist analyse
-        matching_exist = mongo.db.matching.find_one(
-            {"job_id": job["_id"], "candidate_id": candidate["_id"]}
+    Raises:
+        requests.HTTPError: The analysis service rejected the job
+    """
+    analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/matching/jobs"
+    response = analysis_session().post(
+        analysis_endpoint_url,
+        json={"job_id": job["_id"], "job": job},
+        **analysis_request_options(config.ANALYSIS_DEADLINE_MS),
+    )
+    response.raise_for_status()
+
+    return response.json()["job_key"]
+
+
+def stream_matching_batch(job, candidates, packed=False, job_key=None):
+    """
+    Score a batch of candidates against one job in a single request
+
+    Args:
+        job (dict): Serialized job document
+        candidates (list): Serialized candidate documents
+        packed (bool): Score several candidates per LLM call
+        job_key (str): Key from register_job_context, the job is registered again if the service lost it
+
+    Yields:
+        dict: One result per candidate as soon as the analysis service streams it
+
+    Raises:
+        requests.HTTPError: The analysis service rejected the batch
+    """
+    analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/matching/analyse-batch"
+    job_key = job_key or register_job_context(job)
+    for attempt in range(2):
+        with analysis_session().post(
+            analysis_endpoint_url,
+            json={"job_key": job_key, "candidates": candidates, "packed": packed},
+            stream=True,
+            **analysis_request_options(config.MATCHING_BATCH_DEADLINE_MS),
+        ) as response:
+            # The analysis service restarted or evicted the job context
+            if response.status_code == 404 and attempt == 0:
+                job_key = register_job_context(job)
+                continue
+
+            # The executor counts the whole batch as failed
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+            return
+
+
+def get_scored_rows(job_id, since_id, seen_ids):
+    """
+    Matching table rows of the candidates scored for a job after since_id
+
+    Args:
+        job_id (ObjectId): Job of the run
+        since_id (ObjectId): Matchings created before this id are skipped
+        seen_ids (set): Matching ids already returned, updated in place
+
+    Returns:
+        list: (matching id, row) pairs in creation order
+    """
+    matchings = [
+        matching
+        for matching in mongo.db.matching.find(
+            {"job_id": job_id, "_id": {"$gt": since_id}},
+            {"candidate_id": 1, "score": 1, "summary_comment": 1},
+        ).sort("_id", 1)
+        if matching["_id"] not in seen_ids
+    ]
+    if not matchings:
+        return []
+
+    candidate_ids = [matching["candidate_id"] for matching in matchings]
+    candidates = {
+        candidate["_id"]: candidate
+        for candidate in mongo.db.candidate.find({"_id": {"$in": candidate_ids}}, MATCHING_ROW_PROJECTION)
+    }
+    prefilter_scores = {
+        doc["candidate_id"]: doc["score"]
+        for doc in mongo.db.prefilter.find(
+            {"job_id": job_id, "candidate_id": {"$in": candidate_ids}}, {"candidate_id": 1, "score": 1, "_id": 0}
         )
+    }
 
-        if matching_exist:
-            logger.info(
-                f"Matching exist candidate & job: {candidate['candidate_name']} - {job['job_name']}"
-            )
+    rows = []
+    for matching in matchings:
+        seen_ids.add(matching["_id"])
+        candidate = candidates.get(matching["candidate_id"])
+        # Deleted since it was scored
+        if candidate is None:
             continue
+        rows.append(
+            (
+                matching["_id"],
+                matching_row(
+                    candidate,
+                    matching["score"],
+                    matching["summary_comment"],
+                    True,
+                    False,
+                    prefilter_scores.get(candidate["_id"], 0),
+                ),
+            )
+        )
+    return rows
 
-        matching_analyse = {
-            "candidate": serialize_doc(candidate),
-            "job": serialize_doc(job),
-        }
 
-        logger.info(
-            f"Matching candidate & job: {candidate['candidate_name']} - {job['job_name']}"
-        )
+def get_matched_candidate_ids(job_id):
+    """Ids of the candidates that already have an LLM score for a job, in one projected query"""
+    return {
+        doc["candidate_id"]
+        for doc in mongo.db.matching.find({"job_id": job_id}, {"candidate_id": 1, "_id": 0})
+    }
 
-        analysis_endpoint_url = f"{config.ANALYSIS_SERVICE_URL}/matching/analyse"
-        response = requests.post(analysis_endpoint_url, json=matching_analyse)
 
-        # Check response status and return appropriate response
-        if response.status_code != 200:
-            abort(400, message="Fail to analyse matching!")
+def get_matching_scores(job_id):
+    """LLM score and comment of every candidate matched for a job, by candidate id, in one projected query"""
+    return {
+        doc["candidate_id"]: doc
+        for doc in mongo.db.matching.find(
+            {"job_id": job_id}, {"candidate_id": 1, "score": 1, "summary_comment": 1, "_id": 0}
+        )
+    }
+
 
-        # Get the content of the response
-        response_content = response.json()
+def plan_matching(job, options):
+    """
+    Prefilter the candidates of a job and keep those without an LLM score
 
-        response_content["job_id"] = ObjectId(job["_id"])
-        response_content["candidate_id"] = ObjectId(candidate["_id"])
+    Runs that stopped half way are resumed by planning them again, candidates
+    scored before the stop are skipped.
 
-        # Add to database
-        try:
-            collection = mongo.db.matching
-            result = collection.insert_one(response_content)
+    Args:
+        job (dict): Job document
+        options (dict): top_k and min_score of the prefilter
 
-            logger.info(f"id matching {result.inserted_id}")
+    Returns:
+        tuple: Number of selected candidates, and the serialized candidates that still need a score
+    """
+    planning_start = time.perf_counter()
+    matched_ids = get_matched_candidate_ids(job["_id"])
 
-        except Exception as e:
-            logger.error(f"Upload document to Database failed! Error: {str(e)}")
-            abort(400, message="Upload document to Database failed!")
+    # Candidates without resumes are filtered by the query, only the fields used downstream are loaded
+    candidates = list(
+        mongo.db.candidate.find({"has_resume": {"$ne": False}}, MATCHING_CANDIDATE_PROJECTION)
+    )
 
-    return {"message": "Analyse matching successfully!"}
+    # Rank every candidate lexically, only the best ones go to the LLM
+    ranked = prefilter_service.rank_candidates(job, candidates)
+    prefilter_service.store_scores(job["_id"], ranked)
+    selected = prefilter_service.select_candidates(
+        ranked,
+        top_k=options.get("top_k", config.PREFILTER_TOP_K),
+        min_score=options.get("min_score", config.PREFILTER_MIN_SCORE),
+    )
+    logger.info(f"Prefilter kept {len(selected)} of {len(ranked)} candidates")
+
+    # Collect candidates that still need a score
+    candidates_to_match = [
+        serialize_doc(candidate)
+        for candidate, _ in selected
+        if candidate["_id"] not in matched_ids
+    ]
+    logger.info(
+        f"Planned matching for {job['job_name']} in {(time.perf_counter() - planning_start) * 1000:.1f} ms: "
+        f"{len(candidates_to_match)} to score, {len(selected) - len(candidates_to_match)} already matched"
+    )
+    return len(selected), candidates_to_match
+
+
+def create_matching_executor(job, candidates, options):
+    """
+    Build the executor that scores candidates of a job through the analysis service
+
+    Args:
+        job (dict): Job document
+        candidates (list): Serialized candidates from plan_matching
+        options (dict): packed mode of the run
+
+    Returns:
+        MatchingExecutor: Executor writing results to the matching collection
+    """
+    job = serialize_doc(dict(job))
+    packed = options.get("packed", config.MATCHING_PACKED)
+    # Every batch references the job by key, the requirement is sent once
+    job_key = register_job_context(job) if candidates else None
+
+    # Batches stream in parallel, results are written in bulk as they land
+    return MatchingExecutor(
+        job,
+        score_batch=lambda batch: stream_matching_batch(job, batch, packed=packed, job_key=job_key),
+        writer=MatchingResultWriter(mongo.db.matching),
+    )
 
 
 def filter_matching_data(matching_data):
@@ -105,6 +261,8 @@ def filter_matching_data(matching_data):
         page_size=matching_data["page_size"],
         page=matching_data["page"],
         job_id=job_id,
+        job=job_exist,
+        mode=matching_data.get("mode", "llm"),
     )
     try:
         pass
@@ -115,7 +273,27 @@ def filter_matching_data(matching_data):
     return results
 
 
-def filter_page(page_size, page, job_id):
+# Candidate fields shown in a row of the matching table
+MATCHING_ROW_PROJECTION = {"candidate_name": 1, "email": 1, "phone_number": 1, "cv_name": 1}
+
+
+def matching_row(candidate, score, summary_comment, matching_status, provisional, prefilter_score):
+    """Row of the matching table for a candidate"""
+    return {
+        "id": candidate["_id"],
+        "candidate_name": candidate["candidate_name"],
+        "candidate_email": candidate["email"],
+        "candidate_phone": candidate["phone_number"],
+        "cv_name": candidate["cv_name"],
+        "score": score,
+        "summary_comment": summary_comment,
+        "matching_status": matching_status,
+        "provisional": provisional,
+        "prefilter_score": prefilter_score,
+    }
+
+
+def filter_page(page_size, page, job_id, job=None, mode="llm"):
     page_size = 10 if page_size is None else page_size
     page = 1 if page is None else page - 1
 
@@ -132,44 +310,61 @@ def filter_page(page_size, page, job_id):
     if page < 0 or page_size < 0:
         abort(400, message="Page number or page size is invalid.")
 
+    # Lexical scores let candidates skipped by the prefilter still be ordered
+    prefilter_scores = prefilter_service.get_scores(job_id)
+
+    candidates = list(collection_candidate.find())
+    matching_scores = get_matching_scores(job_id)
+    matchings = [matching_scores.get(candidate["_id"]) for candidate in candidates]
+
+    # Provisional mode fills candidates without an LLM score with the deterministic score
+    provisional_scores = {}
+    if mode == "provisional" and job is not None:
+        unscored = [
+            candidate
+            for candidate, matching in zip(candidates, matchings)
+            if matching is None
+        ]
+        scores = scoring_service.score_candidates(job, unscored)
+        provisional_scores = {
+            candidate["_id"]: round(float(score), 2)
+            for candidate, score in zip(unscored, scores)
+        }
+
     # Create an empty list to store the modified candidates with scores.
     modified_results = []
 
-    for candidate in collection_candidate.find():
-        matching = mongo.db.matching.find_one(
-            {"job_id": job_id, "candidate_id": candidate["_id"]}
-        )
-
-        # print("job_id", job_id)
-        # print("candidate_id", candidate["_id"])
-        # print("job_id", type(job_id))
-        # print("candidate_id", type(candidate["_id"]))
-        # print(f"matching {matching}")
-
+    for candidate, matching in zip(candidates, matchings):
+        provisional = False
         if matching is not None:
             score = matching["score"]
             summary_comment = matching["summary_comment"]
             matching_status = True
+        elif candidate["_id"] in provisional_scores:
+            score = provisional_scores[candidate["_id"]]
+            summary_comment = ""
+            matching_status = False
+            provisional = True
         else:
             score = 0
             summary_comment = ""
             matching_status = False
 
         modified_results.append(
-            {
-                "id": candidate["_id"],
-                "candidate_name": candidate["candidate_name"],
-                "candidate_email": candidate["email"],
-                "candidate_phone": candidate["phone_number"],
-                "cv_name": candidate["cv_name"],
-                "score": score,
-                "summary_comment": summary_comment,
-                "matching_status": matching_status,
-            }
+            matching_row(
+                candidate,
+                score,
+                summary_comment,
+                matching_status,
+                provisional,
+                prefilter_scores.get(candidate["_id"], 0),
+            )
         )
 
     modified_results = sorted(
-        modified_results, key=lambda candidate: int(candidate["score"]), reverse=True
+        modified_results,
+        key=lambda candidate: (float(candidate["score"]), candidate["prefilter_score"]),
+        reverse=True,
     )
 
     # Implement pagination on the modified_results list.
@@ -0,0 +1,135 @@
+import logging
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from app.db import mongo
+from app.utils.text import field_terms
+from pymongo import UpdateOne
+from pytz import timezone
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Structured fields used for lexical matching, skills count the most
+FIELD_WEIGHTS = {
+    "technical_skill": 3,
+    "experience": 2,
+    "responsibility": 1,
+    "degree": 1,
+    "certificate": 1,
+    "soft_skill": 1,
+}
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def bm25_scores(query_terms, documents_terms, k1=BM25_K1, b=BM25_B):
+    """
+    Score documents against a query with BM25, vectorized over all documents
+
+    Args:
+        query_terms (list): Terms of the job, repeated terms weigh more
+        documents_terms (list): Terms of each candidate
+
+    Returns:
+        numpy.ndarray: Scores normalised to 0 - 1 by the BM25 upper bound
+    """
+    if not documents_terms:
+        return np.zeros(0)
+
+    query_counts = Counter(query_terms)
+    vocabulary = {term: column for column, term in enumerate(query_counts)}
+    if not vocabulary:
+        return np.zeros(len(documents_terms))
+
+    tf = np.zeros((len(documents_terms), len(vocabulary)), dtype=np.float64)
+    lengths = np.zeros(len(documents_terms), dtype=np.float64)
+    for row, terms in enumerate(documents_terms):
+        lengths[row] = len(terms)
+        for term, count in Counter(terms).items():
+            column = vocabulary.get(term)
+            if column is not None:
+                tf[row, column] = count
+
+    n_documents = len(documents_terms)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_documents - df + 0.5) / (df + 0.5))
+    query_weights = idf * np.fromiter(query_counts.values(), dtype=np.float64)
+
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * lengths[:, None] / avg_length)
+    scores = (tf * (k1 + 1) / (tf + norm)) @ query_weights
+
+    upper_bound = (k1 + 1) * query_weights.sum()
+    return scores / upper_bound if upper_bound > 0 else scores
+
+
+def rank_candidates(job, candidates):
+    """
+    Rank candidates for a job by lexical similarity of their structured fields
+
+    Args:
+        job (dict): Job document
+        candidates (list): Candidate documents
+
+    Returns:
+        list: (candidate, score) pairs, best first
+    """
+    scores = bm25_scores(
+        field_terms(job, FIELD_WEIGHTS),
+        [field_terms(candidate, FIELD_WEIGHTS) for candidate in candidates],
+    )
+    order = np.argsort(-scores, kind="stable")
+    return [(candidates[i], float(scores[i])) for i in order]
+
+
+def select_candidates(ranked, top_k=None, min_score=None):
+    """
+    Keep the top K ranked candidates whose score reaches the similarity floor
+
+    Args:
+        ranked (list): (candidate, score) pairs, best first
+        top_k (int): Max candidates to keep, 0 or None keeps all
+        min_score (float): Similarity floor, 0 or None disables it
+
+    Returns:
+        list: Selected (candidate, score) pairs
+    """
+    selected = ranked[:top_k] if top_k else ranked
+    if min_score:
+        selected = [(candidate, score) for candidate, score in selected if score >= min_score]
+    return selected
+
+
+def store_scores(job_id, ranked):
+    """Persist prefilter scores so skipped candidates can still be paginated"""
+    if not ranked:
+        return
+
+    updated_at = datetime.now(timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
+    operations = [
+        UpdateOne(
+            {"job_id": job_id, "candidate_id": candidate["_id"]},
+            {"$set": {"score": score, "rank": rank, "updated_at": updated_at}},
+            upsert=True,
+        )
+        for rank, (candidate, score) in enumerate(ranked, 1)
+    ]
+    mongo.db.prefilter.bulk_write(operations, ordered=False)
+
+
+def get_scores(job_id):
+    """
+    Load stored prefilter scores of a job
+
+    Returns:
+        dict: candidate_id -> prefilter score
+    """
+    return {
+        doc["candidate_id"]: doc["score"]
+        for doc in mongo.db.prefilter.find(
+            {"job_id": job_id}, {"candidate_id": 1, "score": 1, "_id": 0}
+        )
+    }
@@ -0,0 +1,104 @@
+import numpy as np
+from app.utils.text import tokenize
+
+# Same sections and weights as analyse_matching in analysis_service/src/matching/service.py
+SECTION_WEIGHTS = {
+    "degree": 0.1,
+    "experience": 0.2,
+    "technical_skill": 0.3,
+    "responsibility": 0.25,
+    "certificate": 0.1,
+    "soft_skill": 0.05,
+}
+
+
+# Sections the analysis service annotates with canonical IDs under "<section>_ids"
+ID_SECTIONS = {"degree", "technical_skill", "certificate"}
+
+
+def section_terms(doc, section):
+    values = doc.get(section) or []
+    if isinstance(values, str):
+        values = [values]
+    return {term for value in values for term in tokenize(value)}
+
+
+def section_ids(doc, section):
+    """Canonical IDs of a section, None when missing or stale after a manual edit."""
+    if section not in ID_SECTIONS:
+        return None
+    values = doc.get(section) or []
+    if isinstance(values, str):
+        values = [values]
+    ids = doc.get(f"{section}_ids")
+    if not isinstance(ids, list) or len(ids) != len(values):
+        return None
+    return {term_id for term_id in ids if term_id is not None}
+
+
+def coverage(required, candidates_terms):
+    """Share (0 - 100) of the required terms found in each candidate's terms."""
+    vocabulary = {term: i for i, term in enumerate(sorted(required))}
+    if not vocabulary:
+        return np.full(len(candidates_terms), 100.0)
+
+    hits = np.zeros((len(candidates_terms), len(vocabulary)), dtype=bool)
+    for row, terms in enumerate(candidates_terms):
+        columns = [vocabulary[term] for term in terms if term in vocabulary]
+        hits[row, columns] = True
+    return hits.mean(axis=1) * 100
+
+
+def section_scores(job, candidates):
+    """
+    Score every section of every candidate by overlap with the job requirement
+
+    A section scores the share (0 - 100) of the job's terms for that section
+    found in the candidate's same section. Sections the job leaves empty
+    score 100 since nothing is required. Degree, skill and certificate
+    sections compare canonical IDs when both documents carry them, so
+    "ReactJS" and "React.js" match, and fall back to word tokens otherwise.
+
+    Args:
+        job (dict): Job document
+        candidates (list): Candidate documents
+
+    Returns:
+        numpy.ndarray: Matrix of shape (candidates, sections)
+    """
+    scores = np.empty((len(candidates), len(SECTION_WEIGHTS)), dtype=np.float64)
+
+    for column, section in enumerate(SECTION_WEIGHTS):
+        scores[:, column] = coverage(
+            section_terms(job, section),
+            [section_terms(candidate, section) for candidate in candidates],
+        )
+
+        job_ids = section_ids(job, section)
+        if job_ids is None:
+            continue
+
+        candidates_ids = [section_ids(candidate, section) for candidate in candidates]
+        rows = [row for row, ids in enumerate(candidates_ids) if ids is not None]
+        if rows:
+            scores[rows, column] = coverage(job_ids, [candidates_ids[row] for row in rows])
+
+    return scores
+
+
+def score_candidates(job, candidates):
+    """
+    Deterministic weighted score of candidates for a job, without the LLM
+
+    Args:
+        job (dict): Job document
+        candidates (list): Candidate documents
+
+    Returns:
+        numpy.ndarray: Weighted scores (0 - 100), one per candidate
+    """
+    if not candidates:
+        return np.zeros(0)
+
+    weights = np.fromiter(SECTION_WEIGHTS.values(), dtype=np.float64)
+    return section_scores(job, candidates) @ weights / weights.sum()
@@ -0,0 +1,63 @@
+import os
+import threading
+
+import config
+import requests
+from requests.adapters import HTTPAdapter
+
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def analysis_request_options(deadline_ms):
+    """
+    Build the deadline header and client timeout for an analysis service call
+
+    Args:
+        deadline_ms (int): How long the caller is willing to wait, 0 for no limit
+
+    Returns:
+        dict: Keyword arguments for requests.post
+    """
+    if not deadline_ms:
+        # Never hang on an unreachable service, even without a deadline
+        return {"timeout": (config.ANALYSIS_CONNECT_TIMEOUT, None)}
+
+    return {
+        "headers": {DEADLINE_HEADER: str(deadline_ms)},
+        # Give the analysis service a moment to report the deadline itself
+        "timeout": (config.ANALYSIS_CONNECT_TIMEOUT, deadline_ms / 1000 + config.ANALYSIS_TIMEOUT_MARGIN),
+    }
+
+
+def analysis_session():
+    """
+    Shared session for analysis service calls
+
+    Connections are kept alive and pooled up to ANALYSIS_POOL_SIZE, threads
+    wait for a free connection instead of opening more.
+
+    Returns:
+        requests.Session: Session of the current process
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=config.ANALYSIS_POOL_SIZE, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _reset_session():
+    # Sockets of the parent process must not be shared with a forked child
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_session)
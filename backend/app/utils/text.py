@@ -0,0 +1,49 @@
+import re
+
+# Keeps tech tokens such as c++, c#, node.js and .net intact
+TOKEN_PATTERN = re.compile(r"(?:(?<![.\w])\.)?[a-z0-9](?:[a-z0-9.#+]*[a-z0-9#+])?")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "have", "in", "is", "it", "of", "on", "or", "the", "to", "with", "will",
+    "year", "years", "experience", "knowledge", "skill", "skills", "good",
+    "strong", "ability", "etc", "e.g", "using", "work", "working",
+}
+
+
+def tokenize(text):
+    """
+    Split free text into lowercase lexical terms
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Terms without stopwords
+    """
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOPWORDS
+    ]
+
+
+def field_terms(doc, field_weights):
+    """
+    Collect the terms of the structured fields of a candidate or job document
+
+    Args:
+        doc (dict): Mongo document
+        field_weights (dict): Field name -> how many times its terms are counted
+
+    Returns:
+        list: Terms, repeated according to the field weight
+    """
+    terms = []
+    for field, weight in field_weights.items():
+        values = doc.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        for value in values:
+            terms.extend(tokenize(value) * weight)
+    return terms
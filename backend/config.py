@@ -4,6 +4,45 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 
 ANALYSIS_SERVICE_URL = os.environ.get("ANALYSIS_SERVICE_URL")
 
+# Time budgets passed to the analysis service as X-Request-Deadline-Ms, 0 disables
+ANALYSIS_DEADLINE_MS = int(os.environ.get("ANALYSIS_DEADLINE_MS", 120000))
+MATCHING_BATCH_DEADLINE_MS = int(os.environ.get("MATCHING_BATCH_DEADLINE_MS", 900000))
+ANALYSIS_TIMEOUT_MARGIN = float(os.environ.get("ANALYSIS_TIMEOUT_MARGIN", 5))
+
+# Offer the CV hash to the analysis service first and upload the bytes only when it is unknown
+ANALYSIS_HASH_FIRST = os.environ.get("ANALYSIS_HASH_FIRST", "true").lower() == "true"
+
+# Number of candidates sent per /matching/analyse-batch request
+MATCHING_BATCH_SIZE = int(os.environ.get("MATCHING_BATCH_SIZE", 100))
+
+# Lexical prefilter: only the top K candidates above the floor reach the LLM, 0 disables
+PREFILTER_TOP_K = int(os.environ.get("PREFILTER_TOP_K", 100))
+PREFILTER_MIN_SCORE = float(os.environ.get("PREFILTER_MIN_SCORE", 0.05))
+
+# Score several candidates per LLM call for bulk ranking
+MATCHING_PACKED = os.environ.get("MATCHING_PACKED", "false").lower() == "true"
+
+# Batches of one matching run streamed in parallel, and results buffered per bulk_write
+MATCHING_CONCURRENCY = int(os.environ.get("MATCHING_CONCURRENCY", 4))
+MATCHING_WRITE_BUFFER = int(os.environ.get("MATCHING_WRITE_BUFFER", 50))
+
+# Matching runs are executed by matching_worker.py: lease of a claimed run, how often the
+# worker renews it and saves progress, how often an idle worker polls, and retries of a failing run
+MATCHING_RUN_LEASE_SECONDS = int(os.environ.get("MATCHING_RUN_LEASE_SECONDS", 120))
+MATCHING_RUN_HEARTBEAT_SECONDS = float(os.environ.get("MATCHING_RUN_HEARTBEAT_SECONDS", 10))
+MATCHING_WORKER_POLL_SECONDS = float(os.environ.get("MATCHING_WORKER_POLL_SECONDS", 2))
+MATCHING_RUN_MAX_ATTEMPTS = int(os.environ.get("MATCHING_RUN_MAX_ATTEMPTS", 3))
+# Delay before a failed run is retried, doubled on every attempt
+MATCHING_RUN_RETRY_BACKOFF_SECONDS = float(os.environ.get("MATCHING_RUN_RETRY_BACKOFF_SECONDS", 15))
+
+# Progress event stream of a run: how often it reads MongoDB, and how long one connection stays open
+MATCHING_STREAM_POLL_SECONDS = float(os.environ.get("MATCHING_STREAM_POLL_SECONDS", 1))
+MATCHING_STREAM_MAX_SECONDS = int(os.environ.get("MATCHING_STREAM_MAX_SECONDS", 300))
+
+# Keep-alive connections to the analysis service shared by all threads, and the connect timeout in seconds
+ANALYSIS_POOL_SIZE = int(os.environ.get("ANALYSIS_POOL_SIZE", 16))
+ANALYSIS_CONNECT_TIMEOUT = float(os.environ.get("ANALYSIS_CONNECT_TIMEOUT", 5))
+
 
 class DefaultConfig:
     """
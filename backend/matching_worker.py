@@ -0,0 +1,33 @@
+"""
+Matching worker: claims queued matching runs from MongoDB and executes them.
+
+Start as many as needed, each run is held by one worker through a lease. A
+run whose worker crashed is resumed by another one once the lease expires,
+candidates scored before the crash are not scored again.
+
+Usage:
+    python matching_worker.py
+"""
+import signal
+import threading
+
+from app import app
+from app.services import matching_run_service
+
+
+def main():
+    stop_event = threading.Event()
+
+    def stop(signum, frame):
+        # The run in progress stops and is handed back to the queue
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    with app.app_context():
+        matching_run_service.run_worker(stop_event)
+
+
+if __name__ == "__main__":
+    main()
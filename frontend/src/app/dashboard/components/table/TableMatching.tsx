@@ -1,5 +1,6 @@
 "use client";
-import React, { useState, useEffect } from "react";
+import React, { useState } from "react";
+import { useQueryClient } from "@tanstack/react-query";
 
 import { createColumnHelper, Row } from "@tanstack/react-table";
 import { TablePagination, Drawer } from "@mui/material";
@@ -66,6 +67,10 @@ const TableFAQ = (props: Props) => {
     selectedJobId
   );
   const [loadingMatching, setLoadingMatching] = React.useState<boolean>(false);
+  const [matchingProgress, setMatchingProgress] = React.useState<{
+    done: number;
+    total: number;
+  } | null>(null);
   const [recordLimit, setRecordLimit] = React.useState(20);
   const [isExportDialogOpen, setIsExportDialogOpen] = React.useState(false);
   const [tempRecordLimit, setTempRecordLimit] = React.useState(20);
@@ -89,37 +94,43 @@ const TableFAQ = (props: Props) => {
   const { mutate: updateFAQ } = useUpdateFAQData(dataForm, faqId);
   const { mutate: sendShortlistNotify } = useShortlistNotification(selectedJobName, shortlistTopN);
 
+  const queryClient = useQueryClient();
+
+  // The stream outlives page changes, read the page being viewed when a result arrives
+  const pageRef = React.useRef({ currentPage, pageSize });
+  pageRef.current = { currentPage, pageSize };
+
+  // Place a newly scored candidate in the page being viewed, ranked by score
+  const upsertMatchingRow = (row: JobMatchingModel) => {
+    const { currentPage, pageSize } = pageRef.current;
+    queryClient.setQueryData<JobMatchingResponeModel>(
+      ["matching-page-data", currentPage + 1, pageSize],
+      (old) => {
+        if (!old) return old;
+        const known = old.results.some((item) => item.id === row.id);
+        // Later pages only refresh the rows they already show
+        if (!known && currentPage !== 0) return old;
+        const results = [
+          ...old.results.filter((item) => item.id !== row.id),
+          row,
+        ]
+          .sort((a, b) => Number(b.score) - Number(a.score))
+          .slice(0, pageSize);
+        // total_matching counts candidates and drives the pagination, it does not change
+        return { ...old, results };
+      }
+    );
+  };
+
   // Define a state variable to store the selected job name
-  const { mutate: processMatching } = useMachingData(selectedJobName);
+  const { mutate: processMatching } = useMachingData(
+    selectedJobName,
+    upsertMatchingRow,
+    (run) => setMatchingProgress({ done: run.done || 0, total: run.total || 0 })
+  );
   const { data, isLoading, isError, isPreviousData, refetch } =
     useMatchingPageData(selectedJobName, currentPage + 1, pageSize);
 
-  // Create a function to periodically refetch data
-  const startAutoRefresh = () => {
-    const interval = 1000; // 3 seconds in milliseconds
-
-    const refreshData = () => {
-      refetch();
-    };
-
-    const refreshInterval = setInterval(refreshData, interval);
-
-    // Return a function to clear the interval when needed
-    return () => {
-      clearInterval(refreshInterval);
-    };
-  };
-
-  // Call startAutoRefresh when the component mounts
-  useEffect(() => {
-    const stopAutoRefresh = startAutoRefresh();
-
-    // Return a cleanup function to clear the interval when the component unmounts
-    return () => {
-      stopAutoRefresh();
-    };
-  }, []); // The empty dependency array ensures this effect runs only once when the component mounts
-
   // Handle item selection
   const handleMenuItemClick = async (jobId: string, jobName: string) => {
     await setSelectedJobId(jobId);
@@ -327,6 +338,7 @@ const TableFAQ = (props: Props) => {
   const handleMatchingCandidate = async () => {
     if (selectedJobName !== "Position Name") {
       setLoadingMatching(true);
+      setMatchingProgress(null);
 
       processMatching(
         {},
@@ -334,10 +346,12 @@ const TableFAQ = (props: Props) => {
           onError: (error: any) => {
             // console.log('Matching error:', error.response.status);
             setLoadingMatching(false);
+            setMatchingProgress(null);
             toast.error("Process Matching Candidate failed");
           },
           onSuccess: async () => {
             setLoadingMatching(false);
+            setMatchingProgress(null);
             setIsOpenModalAdd(false);
             setInputs([]);
             refetch();
@@ -652,7 +666,9 @@ const TableFAQ = (props: Props) => {
                       fill="currentColor"
                     />
                   </svg>
-                  Processing...
+                  {matchingProgress && matchingProgress.total > 0
+                    ? `Processing ${matchingProgress.done}/${matchingProgress.total}...`
+                    : "Processing..."}
                 </>
               ) : (
                 <>Process Matching</>
@@ -9,6 +9,7 @@ import {
   getFAQAxios,
   getMatchingPage,
   getMatchingCandidate,
+  streamMatchingRun,
   getAllJob,
   getDetailFAQAxios,
   deleteFAQAxios,
@@ -66,10 +67,15 @@ export function useDeleteFAQData(faqId: number): UseMutationResult<any> {
   return useMutation(["faq-delete"], () => deleteFAQAxios(faqId));
 }
 
-export function useMachingData(jobName: string): UseMutationResult<any> {
-  return useMutation(["matching-candidate"], () =>
-    getMatchingCandidate(jobName)
-  );
+export function useMachingData(
+  jobName: string,
+  onResult: (row: JobMatchingModel) => void,
+  onProgress?: (run: any) => void
+): UseMutationResult<any> {
+  return useMutation(["matching-candidate"], async () => {
+    const run = await getMatchingCandidate(jobName);
+    return streamMatchingRun(run.run_id, onResult, onProgress);
+  });
 }
 
 export function useAddFAQData(
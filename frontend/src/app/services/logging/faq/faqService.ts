@@ -28,6 +28,40 @@ export const getMatchingCandidate = async (jobName: string) => {
   return data;
 };
 
+// Matching runs in the background, its results and progress arrive as server-sent events
+export const streamMatchingRun = (
+  runId: string,
+  onResult: (row: JobMatchingModel) => void,
+  onProgress?: (run: any) => void
+) =>
+  new Promise<any>((resolve, reject) => {
+    const source = new EventSource(
+      `${process.env.NEXT_PUBLIC_API_URL}/process-matching/${runId}/events`
+    );
+    source.addEventListener("result", (event) => {
+      const row = JSON.parse((event as MessageEvent).data);
+      onResult({ ...row, score: String(row.score) });
+    });
+    source.addEventListener("progress", (event) => {
+      onProgress?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("end", (event) => {
+      source.close();
+      const run = JSON.parse((event as MessageEvent).data);
+      if (run.status === "failed") {
+        reject(new Error(run.error || "Matching run failed"));
+      } else {
+        resolve(run);
+      }
+    });
+    // Dropped connections are retried by the browser, a closed source will not come back
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Matching run stream closed"));
+      }
+    };
+  });
+
 export const getJobDetailAxios = async (jobId: string) => {
   const { data } = await useAxios.get(`/job/${jobId}`, {
     headers: {